@@ -0,0 +1,82 @@
+"""
+Benchmark da coleta do Meta Ads contra o servidor local da Graph API
+
+Sobe benchmarks/graph_api_server.py no mesmo processo, aponta o
+MetaAdsClient para ele (META_GRAPH_URL) e mede os caminhos de coleta com a
+latência simulada por requisição.
+
+Uso:
+    python benchmarks/bench_meta_collection.py
+    python benchmarks/bench_meta_collection.py --campaigns 100 --days 30 --latency-ms 120
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from config.settings import META_ADS_CONFIG
+from benchmarks.graph_api_server import GraphStandIn, start_server
+
+
+def timed(label, func):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    records = next((result[key] for key in ('total_records', 'total_days', 'total') if key in result), '-')
+    print(f"{label:<42} | {elapsed:>8.2f}s | {records}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--campaigns', type=int, default=50)
+    parser.add_argument('--accounts', type=int, default=10)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--latency-ms', type=int, default=80)
+    args = parser.parse_args()
+
+    server, url = start_server(GraphStandIn(
+        campaigns=args.campaigns,
+        latency_ms=args.latency_ms,
+        report_seconds=1,
+    ))
+
+    account_ids = [str(1000 + index) for index in range(args.accounts)]
+    META_ADS_CONFIG.update(
+        graph_url=url,
+        access_token=META_ADS_CONFIG['access_token'] or 'servidor-local',
+        ad_account_ids=account_ids,
+    )
+
+    from src.meta_ads.client import MetaAdsClient
+
+    client = MetaAdsClient(ad_account_ids=account_ids)
+    date_to = '2026-01-31'
+    date_from = f"2026-01-{32 - min(args.days, 31):02d}"
+
+    print(f"{'caminho':<42} | {'tempo':>9} | registros")
+    print('-' * 70)
+
+    timed('get_insights (síncrono)', lambda: client.get_insights(date_from, date_to, async_mode=False, window_days=0))
+    timed('get_insights (janelas de 7 dias)', lambda: client.get_insights(date_from, date_to, async_mode=False, window_days=7))
+    timed('get_insights (relatório assíncrono)', lambda: client.get_insights(date_from, date_to, async_mode=True, window_days=0))
+    timed('get_daily_summary', lambda: client.get_daily_summary(date_from, date_to))
+    timed('get_campaigns_with_insights (total)', lambda: client.get_campaigns_with_insights(
+        date_from, date_to, time_increment='all_days', breakdowns=()))
+    timed(f'get_account_info x {args.accounts} contas', lambda: {
+        'total': sum(client.for_account(account_id).get_account_info()['success'] for account_id in account_ids)
+    })
+    timed(f'get_account_info_bulk ({args.accounts} contas)', lambda: {
+        'total': len(client.get_account_info_bulk(account_ids)['accounts'])
+    })
+    timed(f'collect_accounts ({args.accounts} contas)', lambda: client.collect_accounts(date_from, date_to))
+
+    print(f"\n📊 {server.state.requests} chamadas atendidas pelo servidor local")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
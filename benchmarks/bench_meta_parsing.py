@@ -0,0 +1,174 @@
+"""
+Benchmark da normalização de insights do Meta Ads
+
+Compara o parser linha a linha original (um dicionário e vários int()/float()
+por insight) com os dois caminhos de src/meta_ads/parsing.py:
+parse_insights_rows (registros, usado por get_insights) e parse_insights_batch
+(colunas, usado pelo cubo e pela hierarquia). O ganho é medido no caminho de
+registros; em Python puro ele fica perto de 1x, o ganho das colunas só vale
+para quem agrega colunas.
+
+Uso:
+    python benchmarks/bench_meta_parsing.py
+    python benchmarks/bench_meta_parsing.py --sizes 10000 100000
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.meta_ads.parsing import parse_insights_batch, parse_insights_rows
+
+BATCH_SIZE = 500
+
+ACTION_TYPES = [
+    'lead',
+    'onsite_conversion.lead_grouped',
+    'offsite_conversion.fb_pixel_lead',
+    'offsite_conversion.fb_pixel_purchase',
+    'purchase',
+    'link_click',
+    'landing_page_view',
+    'post_engagement',
+    'page_engagement',
+    'video_view',
+]
+
+DEVICES = ['iphone', 'android_smartphone', 'desktop', 'ipad', 'android_tablet']
+
+
+def generate_insights(size, seed=42):
+    """Gera insights sintéticos no formato retornado pela Graph API"""
+    rng = random.Random(seed)
+    insights = []
+
+    for index in range(size):
+        impressions = rng.randint(0, 50000)
+        clicks = rng.randint(0, max(impressions // 20, 1))
+        spend = round(rng.uniform(0, 500), 2)
+
+        insights.append({
+            'date_start': f"2026-{(index // 28) % 12 + 1:02d}-{index % 28 + 1:02d}",
+            'campaign_id': str(1000 + index % 40),
+            'campaign_name': f"Campanha {index % 40}",
+            'impression_device': DEVICES[index % len(DEVICES)],
+            'impressions': str(impressions),
+            'clicks': str(clicks),
+            'spend': f"{spend:.2f}",
+            'reach': str(int(impressions * 0.8)),
+            'frequency': f"{rng.uniform(1, 3):.6f}",
+            'cpc': f"{spend / clicks if clicks else 0:.6f}",
+            'cpm': f"{spend / impressions * 1000 if impressions else 0:.6f}",
+            'ctr': f"{clicks / impressions * 100 if impressions else 0:.6f}",
+            'actions': [
+                {'action_type': action_type, 'value': str(rng.randint(1, 30))}
+                for action_type in rng.sample(ACTION_TYPES, rng.randint(0, 5))
+            ],
+        })
+
+    return insights
+
+
+def parse_rowwise(insight):
+    """Parser original de MetaAdsClient.get_insights (uma linha por vez)"""
+    actions = insight.get('actions', [])
+    conversions = 0
+    leads = 0
+
+    for action in actions:
+        action_type = action.get('action_type', '')
+        value = int(action.get('value', 0))
+
+        if 'lead' in action_type.lower():
+            leads += value
+        elif 'conversion' in action_type.lower() or 'purchase' in action_type.lower():
+            conversions += value
+
+    data = {
+        'date': insight.get('date_start'),
+        'campaign_id': insight.get('campaign_id'),
+        'campaign_name': insight.get('campaign_name'),
+        'impressions': int(insight.get('impressions', 0)),
+        'clicks': int(insight.get('clicks', 0)),
+        'spend': float(insight.get('spend', 0)),
+        'reach': int(insight.get('reach', 0)),
+        'frequency': float(insight.get('frequency', 0)),
+        'cpc': float(insight.get('cpc', 0)),
+        'cpm': float(insight.get('cpm', 0)),
+        'ctr': float(insight.get('ctr', 0)),
+        'conversions': conversions,
+        'leads': leads,
+        'platform': 'Meta Ads'
+    }
+
+    if leads > 0:
+        data['cpl'] = round(data['spend'] / leads, 2)
+    else:
+        data['cpl'] = 0
+
+    if data['clicks'] > 0:
+        data['conversion_rate'] = round((conversions / data['clicks']) * 100, 2)
+    else:
+        data['conversion_rate'] = 0
+
+    return data
+
+
+def run_rowwise(insights):
+    return [parse_rowwise(insight) for insight in insights]
+
+
+def run_batched_columns(insights):
+    return [
+        parse_insights_batch(insights[start:start + BATCH_SIZE])
+        for start in range(0, len(insights), BATCH_SIZE)
+    ]
+
+
+def run_rows(insights):
+    rows = []
+    for start in range(0, len(insights), BATCH_SIZE):
+        rows.extend(parse_insights_rows(insights[start:start + BATCH_SIZE]))
+    return rows
+
+
+def timed(func, insights):
+    started = time.perf_counter()
+    result = func(insights)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'linhas':>10} | {'linha a linha':>16} | {'registros':>16} | {'colunas':>16} | ganho")
+    print('-' * 82)
+
+    for size in args.sizes:
+        insights = generate_insights(size)
+
+        baseline, t_rowwise = timed(run_rowwise, insights)
+        rows, t_rows = timed(run_rows, insights)
+        _, t_columns = timed(run_batched_columns, insights)
+
+        # O parser original não tem impression_device: compara só as colunas dele
+        mismatches = sum(
+            1 for old, new in zip(baseline, rows)
+            if old != {key: new.get(key) for key in old}
+        )
+
+        print(
+            f"{size:>10,} | {size / t_rowwise:>11,.0f} l/s | {size / t_rows:>11,.0f} l/s | "
+            f"{size / t_columns:>11,.0f} l/s | {t_rowwise / t_rows:.1f}x"
+            + (f"  ⚠️ {mismatches} divergências" if mismatches else '')
+        )
+
+
+if __name__ == '__main__':
+    main()
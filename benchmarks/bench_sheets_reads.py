@@ -0,0 +1,131 @@
+"""
+Benchmark da leitura da aba de Dados do Google Sheets
+
+Compara o caminho atual (get_all_records: valores formatados, um dicionário
+por linha, depois DataFrame e pd.to_datetime como em dashboard.load_data)
+com GoogleSheetsClient.read_columns (valores sem formatação, uma lista por
+coluna, convertidos direto em colunas tipadas). Os dois lados partem do JSON
+que a API devolveria, então o tempo inclui a decodificação da resposta, mas
+não a rede; o tamanho de cada resposta é mostrado ao lado.
+
+Por padrão as datas são texto 'YYYY-MM-DD', como write_metrics grava (RAW);
+--serial-dates simula uma aba com datas seriais (digitadas ou USER_ENTERED).
+
+Uso:
+    python benchmarks/bench_sheets_reads.py
+    python benchmarks/bench_sheets_reads.py --sizes 10000 100000 --serial-dates
+"""
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+import pandas as pd
+from gspread.utils import numericise_all, to_records
+
+# Adicionar o diretório raiz ao path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.google_sheets.columns import columns_to_frame
+
+HEADERS = [
+    'data', 'plataforma', 'campanha', 'impressoes', 'cliques',
+    'gasto', 'conversoes', 'cpc', 'ctr',
+]
+
+PLATFORMS = ['Meta Ads', 'LinkedIn Ads', 'Google Ads']
+
+# 2024-01-01 como data serial do Sheets
+FIRST_SERIAL = 45292
+
+
+def generate_sheet(size, text_dates=True, seed=42):
+    """
+    Gera a mesma aba nos dois formatos de resposta da API
+
+    Returns:
+        tuple: (JSON formatado por linhas, JSON sem formatação por colunas)
+    """
+    rng = random.Random(seed)
+    formatted = [HEADERS]
+    columns = [[] for _ in HEADERS]
+
+    for index in range(size):
+        day = index // 60
+        impressions = rng.randint(100, 50000)
+        clicks = rng.randint(0, impressions // 20)
+        spend = round(rng.uniform(1, 500), 2)
+        conversions = rng.randint(0, max(clicks // 10, 1))
+        cpc = round(spend / clicks, 2) if clicks else 0
+        ctr = round(clicks / impressions * 100, 2)
+        date = (pd.Timestamp('2024-01-01') + pd.Timedelta(days=day)).strftime('%Y-%m-%d')
+
+        row = [
+            date, PLATFORMS[index % 3], f"Campanha {index % 60}",
+            impressions, clicks, spend, conversions, cpc, ctr,
+        ]
+        formatted.append([str(value) for value in row])
+
+        row[0] = date if text_dates else FIRST_SERIAL + day
+        for column, value in zip(columns, row):
+            column.append(value)
+
+    return json.dumps({'values': formatted}), json.dumps({'values': columns})
+
+
+def read_records(payload):
+    """get_all_records + DataFrame + to_datetime (dashboard.load_data)"""
+    values = json.loads(payload)['values']
+    headers, rows = values[0], values[1:]
+    records = to_records(headers, [numericise_all(row) for row in rows])
+
+    df = pd.DataFrame(records)
+    df['data'] = pd.to_datetime(df['data'])
+    return df
+
+
+def read_columns(payload, size):
+    """read_columns: colunas sem formatação direto em arrays tipados"""
+    values = json.loads(payload)['values']
+    return columns_to_frame(HEADERS, values, size, date_columns=['data'])
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 500_000])
+    parser.add_argument('--serial-dates', action='store_true',
+                        help='datas seriais do Sheets em vez de texto (padrão: texto, como a escrita RAW)')
+    args = parser.parse_args()
+
+    print(f"{'linhas':>10} | {'get_all_records':>16} | {'read_columns':>14} | {'resposta (MB)':>15} | ganho")
+    print('-' * 78)
+
+    for size in args.sizes:
+        rows_payload, columns_payload = generate_sheet(size, text_dates=not args.serial_dates)
+
+        baseline, t_records = timed(read_records, rows_payload)
+        frame, t_columns = timed(read_columns, columns_payload, size)
+
+        mismatches = [
+            name for name in HEADERS
+            if not baseline[name].astype(str).equals(frame[name].astype(str))
+        ]
+
+        print(
+            f"{size:>10,} | {t_records:>15.2f}s | {t_columns:>13.2f}s | "
+            f"{len(rows_payload) / 1e6:>6.1f} / {len(columns_payload) / 1e6:<6.1f} | "
+            f"{t_records / t_columns:.1f}x"
+            + (f"  ⚠️ divergências em: {', '.join(mismatches)}" if mismatches else '')
+        )
+
+
+if __name__ == '__main__':
+    main()
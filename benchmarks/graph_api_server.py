@@ -0,0 +1,597 @@
+"""
+Servidor local que imita os endpoints da Graph API usados pelo MetaAdsClient
+
+Atende conta, campanhas (inclusive com insights expandidos), insights
+paginados, relatórios assíncronos (AdReportRun) e requisições em lote, com
+dados sintéticos determinísticos ou gravados (--fixtures). Escala, latência
+e cabeçalhos de uso (x-app-usage, x-business-use-case-usage) são
+configuráveis, para medir coleta e parsing sem chamar o Meta.
+
+Uso:
+    python benchmarks/graph_api_server.py --port 8765 --campaigns 200 --latency-ms 80
+
+    # Em outro terminal, apontando o cliente para o servidor local:
+    META_GRAPH_URL=http://127.0.0.1:8765 META_ACCESS_TOKEN=teste \\
+        META_AD_ACCOUNT_ID=act_1000 python src/meta_ads/client.py
+
+Fixtures gravadas: um arquivo JSON por caminho, com '/' trocado por '__'
+(ex.: act_1000.json, act_1000__campaigns.json). Listas são paginadas como
+qualquer edge; objetos são devolvidos como estão.
+"""
+import json
+import time
+import zlib
+import random
+import argparse
+import threading
+import itertools
+import re
+from collections import deque
+from pathlib import Path
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+DEVICES = ['iphone', 'android_smartphone', 'desktop', 'ipad']
+
+# Valores sintéticos de cada breakdown
+BREAKDOWN_VALUES = {
+    'impression_device': DEVICES,
+    'publisher_platform': ['facebook', 'instagram', 'audience_network', 'messenger'],
+    'platform_position': ['feed', 'story', 'reels', 'search'],
+    'age': ['18-24', '25-34', '35-44', '45-54', '55-64', '65+'],
+    'gender': ['female', 'male', 'unknown'],
+    'region': ['Sao Paulo', 'Rio de Janeiro', 'Minas Gerais', 'Parana', 'Bahia'],
+    'country': ['BR'],
+    'hourly_stats_aggregated_by_advertiser_time_zone': [
+        f"{hour:02d}:00:00 - {hour:02d}:59:59" for hour in range(24)
+    ],
+}
+
+ACTION_TYPES = [
+    'lead',
+    'onsite_conversion.lead_grouped',
+    'offsite_conversion.fb_pixel_purchase',
+    'link_click',
+    'landing_page_view',
+    'post_engagement',
+]
+
+STATUSES = ['ACTIVE', 'ACTIVE', 'ACTIVE', 'PAUSED']
+
+
+class GraphError(Exception):
+    """Erro devolvido no formato {'error': {...}} da Graph API"""
+
+    def __init__(self, status, code, message, subcode=None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+        self.subcode = subcode
+
+    def body(self):
+        return {'error': {
+            'message': self.message,
+            'type': 'OAuthException',
+            'code': self.code,
+            'error_subcode': self.subcode,
+            'fbtrace_id': 'local',
+        }}
+
+
+class GraphStandIn:
+    """Estado e respostas do servidor (campanhas, relatórios, uso do limite)"""
+
+    def __init__(self, campaigns=50, adsets_per_campaign=2, ads_per_adset=2, latency_ms=0,
+                 calls_per_hour=0, report_seconds=3, default_limit=25, fixtures=None, seed=42):
+        """
+        Args:
+            campaigns (int): Campanhas por conta
+            adsets_per_campaign (int): Conjuntos de anúncios por campanha
+            ads_per_adset (int): Anúncios por conjunto
+            latency_ms (int): Atraso de cada requisição HTTP (ms)
+            calls_per_hour (int): Limite simulado de chamadas por hora (0 = uso sempre baixo)
+            report_seconds (float): Duração de um relatório assíncrono
+            default_limit (int): Itens por página quando 'limit' não é enviado
+            fixtures (Path): Diretório com respostas gravadas
+            seed (int): Semente dos dados sintéticos
+        """
+        self.campaigns = campaigns
+        self.adsets_per_campaign = adsets_per_campaign
+        self.ads_per_adset = ads_per_adset
+        self.latency_ms = latency_ms
+        self.calls_per_hour = calls_per_hour
+        self.report_seconds = report_seconds
+        self.default_limit = default_limit
+        self.fixtures = Path(fixtures) if fixtures else None
+        self.seed = seed
+        self.reports = {}
+        self.call_times = deque()
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------------------- uso
+
+    def register_call(self, count=1):
+        """Conta chamadas na última hora e retorna o uso (%)"""
+        now = time.time()
+        with self._lock:
+            self.requests += count
+            self.call_times.extend([now] * count)
+            cutoff = now - 3600
+            while self.call_times and self.call_times[0] < cutoff:
+                self.call_times.popleft()
+            calls = len(self.call_times)
+
+        if not self.calls_per_hour:
+            return min(calls / 1000, 5)
+        return calls / self.calls_per_hour * 100
+
+    def usage_headers(self, usage_pct, account_id='1000'):
+        usage_pct = round(min(usage_pct, 100), 1)
+        regain = 1 if usage_pct >= 100 else 0
+        return {
+            'x-app-usage': json.dumps({
+                'call_count': usage_pct,
+                'total_cputime': round(usage_pct / 2, 1),
+                'total_time': round(usage_pct / 2, 1),
+            }),
+            'x-business-use-case-usage': json.dumps({
+                account_id: [{
+                    'type': 'ads_insights',
+                    'call_count': usage_pct,
+                    'total_cputime': round(usage_pct / 2, 1),
+                    'total_time': round(usage_pct / 2, 1),
+                    'estimated_time_to_regain_access': regain,
+                }]
+            }),
+        }
+
+    # ------------------------------------------------------------ entidades
+
+    def _rng(self, *key):
+        return random.Random(zlib.crc32(f"{self.seed}|{'|'.join(map(str, key))}".encode()))
+
+    def account(self, account_id):
+        return {
+            'id': account_id,
+            'account_id': account_id.replace('act_', ''),
+            'name': f"Conta {account_id}",
+            'currency': 'BRL',
+            'account_status': 1,
+            'business_name': 'Empresa Local',
+        }
+
+    def campaign(self, account_id, index):
+        campaign_id = f"{account_id.replace('act_', '')}{index:05d}"
+        rng = self._rng('campaign', campaign_id)
+        updated = datetime(2026, 1, 1) + timedelta(hours=rng.randint(0, 24 * 200))
+        return {
+            'id': campaign_id,
+            'name': f"[{'LEAD' if index % 3 else 'VENDA'}] Campanha {index}",
+            'status': STATUSES[index % len(STATUSES)],
+            'effective_status': STATUSES[index % len(STATUSES)],
+            'objective': 'OUTCOME_LEADS' if index % 3 else 'OUTCOME_SALES',
+            'created_time': '2025-12-01T10:00:00-0300',
+            'updated_time': updated.strftime('%Y-%m-%dT%H:%M:%S-0300'),
+            'account_id': account_id,
+        }
+
+    def campaign_list(self, account_id, filtering=None):
+        campaigns = [self.campaign(account_id, index) for index in range(self.campaigns)]
+        return [campaign for campaign in campaigns if self._matches(campaign, filtering, prefix='')]
+
+    @staticmethod
+    def _matches(campaign, filtering, prefix):
+        for rule in filtering or []:
+            field = rule['field']
+            if not field.startswith(prefix):
+                continue
+            field = field[len(prefix):]
+            value = campaign.get(field)
+            operator = rule['operator']
+            expected = rule['value']
+
+            if field == 'updated_time' and operator == 'GREATER_THAN':
+                stamp = datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z').timestamp()
+                if not stamp > float(expected):
+                    return False
+            elif operator == 'IN' and value not in [str(item) for item in expected]:
+                return False
+            elif operator == 'CONTAIN' and str(expected).lower() not in str(value).lower():
+                return False
+        return True
+
+    # -------------------------------------------------------------- insights
+
+    def insight_rows(self, account_id, params, campaign_id=None):
+        """
+        Linhas de insights para os parâmetros (gerador preguiçoso + total)
+
+        Returns:
+            tuple: (total, função índice -> linha)
+        """
+        level = params.get('level', 'campaign' if campaign_id else 'account')
+        time_range = params.get('time_range') or {}
+        since = time_range.get('since', datetime.now().strftime('%Y-%m-%d'))
+        until = time_range.get('until', since)
+        fields = params.get('fields') or ['impressions', 'clicks', 'spend']
+        breakdowns = params.get('breakdowns') or []
+
+        start = datetime.strptime(since, '%Y-%m-%d')
+        day_count = (datetime.strptime(until, '%Y-%m-%d') - start).days + 1
+        all_days = str(params.get('time_increment', 'all_days')) == 'all_days'
+        buckets = 1 if all_days else day_count
+
+        campaigns = self.campaign_list(account_id)
+        campaigns = [
+            campaign for campaign in campaigns
+            if self._matches(campaign, params.get('filtering'), prefix='campaign.')
+            and (campaign_id is None or campaign['id'] == campaign_id)
+        ]
+
+        if level == 'account':
+            entities = [{}]
+        else:
+            entities = []
+            for campaign in campaigns:
+                base = {'campaign_id': campaign['id'], 'campaign_name': campaign['name']}
+                if level == 'campaign':
+                    entities.append(base)
+                    continue
+                for adset in range(self.adsets_per_campaign):
+                    adset_base = dict(
+                        base,
+                        adset_id=f"{campaign['id']}{adset:02d}",
+                        adset_name=f"Conjunto {adset} - {campaign['name']}",
+                    )
+                    if level == 'adset':
+                        entities.append(adset_base)
+                        continue
+                    for ad in range(self.ads_per_adset):
+                        entities.append(dict(
+                            adset_base,
+                            ad_id=f"{adset_base['adset_id']}{ad:02d}",
+                            ad_name=f"Anúncio {ad} - {adset_base['adset_name']}",
+                        ))
+
+        combos = list(itertools.product(*[
+            BREAKDOWN_VALUES.get(breakdown, ['desconhecido']) for breakdown in breakdowns
+        ]))
+        total = buckets * len(entities) * len(combos)
+        scale = day_count if all_days else 1
+
+        def row(index):
+            bucket, rest = divmod(index, len(entities) * len(combos))
+            entity_index, combo_index = divmod(rest, len(combos))
+            entity = entities[entity_index]
+            combo = combos[combo_index]
+
+            day = since if all_days else (start + timedelta(days=bucket)).strftime('%Y-%m-%d')
+            stop = until if all_days else day
+
+            rng = self._rng(account_id, day, entity.get('ad_id') or entity.get('adset_id') or entity.get('campaign_id'), *combo)
+            impressions = rng.randint(0, 20000) * scale
+            clicks = rng.randint(0, max(impressions // 25, 1))
+            spend = round(rng.uniform(0, 300) * scale, 2)
+            reach = int(impressions * rng.uniform(0.6, 0.9))
+
+            metrics = {
+                'impressions': str(impressions),
+                'clicks': str(clicks),
+                'spend': f"{spend:.2f}",
+                'reach': str(reach),
+                'frequency': f"{impressions / reach if reach else 0:.6f}",
+                'cpc': f"{spend / clicks if clicks else 0:.6f}",
+                'cpm': f"{spend / impressions * 1000 if impressions else 0:.6f}",
+                'cpp': f"{spend / reach * 1000 if reach else 0:.6f}",
+                'ctr': f"{clicks / impressions * 100 if impressions else 0:.6f}",
+                'actions': [
+                    {'action_type': action_type, 'value': str(rng.randint(1, 20) * scale)}
+                    for action_type in rng.sample(ACTION_TYPES, rng.randint(0, 4))
+                ],
+            }
+            metrics['action_values'] = metrics['actions']
+            metrics['cost_per_action_type'] = metrics['actions']
+
+            result = {'date_start': day, 'date_stop': stop}
+            result.update({name: value for name, value in entity.items() if name in fields})
+            result.update({name: value for name, value in metrics.items() if name in fields})
+            result.update(zip(breakdowns, combo))
+            return result
+
+        return total, row
+
+    # ------------------------------------------------------------ roteamento
+
+    def handle(self, method, path, params, base_url):
+        """
+        Responde uma chamada (HTTP direta ou item de lote)
+
+        Returns:
+            tuple: (status HTTP, corpo)
+        """
+        parts = [part for part in path.strip('/').split('/') if part]
+        if parts and re.fullmatch(r'v\d+\.\d+', parts[0]):
+            parts = parts[1:]
+
+        fixture = self._fixture(parts)
+        if fixture is not None:
+            if isinstance(fixture, list):
+                return 200, self._page(fixture, params, parts, base_url)
+            return 200, fixture
+
+        if not parts:
+            if method == 'POST' and 'batch' in params:
+                return 200, self._batch(params['batch'], base_url)
+            raise GraphError(400, 100, 'Requisição sem caminho')
+
+        node = parts[0]
+        edge = parts[1] if len(parts) > 1 else None
+
+        if node.startswith('act_'):
+            if edge is None:
+                return 200, self._select(self.account(node), params)
+            if edge == 'campaigns':
+                return 200, self._campaigns(node, params, parts, base_url)
+            if edge == 'insights' and method == 'POST':
+                return 200, self._submit_report(node, params)
+            if edge == 'insights':
+                return 200, self._insights_page(node, params, parts, base_url)
+
+        if node in self.reports:
+            report = self.reports[node]
+            if edge is None:
+                return 200, self._report_status(node)
+            if edge == 'insights':
+                return 200, self._insights_page(report['account_id'], dict(report['params'], **{
+                    key: value for key, value in params.items() if key in ('limit', 'after')
+                }), parts, base_url)
+
+        if edge == 'insights':
+            # Insights de uma campanha (paginação interna da expansão de campos)
+            account_id = f"act_{node[:-5]}"
+            return 200, self._insights_page(account_id, params, parts, base_url, campaign_id=node)
+
+        raise GraphError(400, 100, f"Caminho não suportado pelo servidor local: /{'/'.join(parts)}")
+
+    def _fixture(self, parts):
+        if not self.fixtures:
+            return None
+        path = self.fixtures / f"{'__'.join(parts) or 'root'}.json"
+        if not path.exists():
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _select(obj, params):
+        fields = params.get('fields')
+        if not fields:
+            return obj
+        return {name: value for name, value in obj.items() if name in fields or name == 'id'}
+
+    def _page(self, items, params, parts, base_url, total=None, summary=False):
+        """Página de uma lista (ou função índice -> item) no formato da Graph API"""
+        limit = int(params.get('limit') or self.default_limit)
+        offset = int(params.get('after') or 0)
+        count = len(items) if total is None else total
+        end = min(offset + limit, count)
+
+        data = [items[index] for index in range(offset, end)] if total is None else [items(index) for index in range(offset, end)]
+        page = {'data': data, 'paging': {'cursors': {'before': str(offset), 'after': str(end)}}}
+
+        if end < count:
+            query = {
+                key: (json.dumps(value) if isinstance(value, (list, dict)) else value)
+                for key, value in params.items()
+            }
+            query['after'] = str(end)
+            page['paging']['next'] = f"{base_url}/v19.0/{'/'.join(parts)}?{urlencode(query)}"
+
+        if summary:
+            page['summary'] = {'total_count': count}
+        return page
+
+    def _campaigns(self, account_id, params, parts, base_url):
+        fields = params.get('fields') or ['id']
+        campaigns = self.campaign_list(account_id, params.get('filtering'))
+
+        expansion = next((field for field in fields if field.startswith('insights')), None)
+        plain = [field for field in fields if not field.startswith('insights')]
+
+        items = []
+        for campaign in campaigns:
+            item = {name: campaign[name] for name in plain if name in campaign}
+            item['id'] = campaign['id']
+            if expansion:
+                insights = self._expanded_insights(account_id, campaign['id'], expansion, base_url)
+                if insights['data']:
+                    item['insights'] = insights
+            items.append(item)
+
+        return self._page(items, params, parts, base_url, summary=bool(params.get('summary')))
+
+    def _expanded_insights(self, account_id, campaign_id, expansion, base_url):
+        """Insights de uma campanha pedidos via insights.time_range(...).breakdowns(...){campos}"""
+        params = {'level': 'campaign'}
+        for name, argument in re.findall(r'\.(\w+)\(([^)]*)\)', expansion.split('{')[0]):
+            params[name] = json.loads(argument) if argument[:1] in '[{"' else argument
+        params['fields'] = expansion[expansion.index('{') + 1:expansion.rindex('}')].split(',')
+        return self._insights_page(
+            account_id, params, [campaign_id, 'insights'], base_url, campaign_id=campaign_id
+        )
+
+    def _insights_page(self, account_id, params, parts, base_url, campaign_id=None):
+        total, row = self.insight_rows(account_id, params, campaign_id=campaign_id)
+        return self._page(row, params, parts, base_url, total=total)
+
+    def _submit_report(self, account_id, params):
+        report_id = f"{900000 + len(self.reports)}"
+        self.reports[report_id] = {
+            'account_id': account_id,
+            'params': params,
+            'submitted_at': time.monotonic(),
+        }
+        return {'report_run_id': report_id}
+
+    def _report_status(self, report_id):
+        elapsed = time.monotonic() - self.reports[report_id]['submitted_at']
+        percent = 100 if not self.report_seconds else min(100, int(elapsed / self.report_seconds * 100))
+        return {
+            'id': report_id,
+            'async_status': 'Job Completed' if percent >= 100 else 'Job Running',
+            'async_percent_completion': percent,
+        }
+
+    def _batch(self, calls, base_url):
+        responses = []
+        for call in calls:
+            url = urlsplit(call['relative_url'])
+            params = decode_params(dict(parse_qsl(url.query)))
+            if call.get('body'):
+                params.update(decode_params(dict(parse_qsl(call['body']))))
+
+            try:
+                status, body = self.handle(call.get('method', 'GET'), url.path, params, base_url)
+            except GraphError as e:
+                status, body = e.status, e.body()
+
+            responses.append({
+                'code': status,
+                'headers': [{'name': 'Content-Type', 'value': 'application/json'}],
+                'body': json.dumps(body),
+            })
+        return responses
+
+
+def decode_params(raw):
+    """Decodifica os parâmetros como o SDK os envia (listas/objetos em JSON, fields com vírgula)"""
+    params = {}
+    for key, value in raw.items():
+        if value[:1] in '[{':
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass
+        if key == 'fields' and isinstance(value, str):
+            value = split_fields(value)
+        params[key] = value
+    return params
+
+
+def split_fields(value):
+    """Separa campos por vírgula, respeitando expansões com {...} e (...)"""
+    fields, depth, current = [], 0, ''
+    for char in value:
+        if char in '{(':
+            depth += 1
+        elif char in '})':
+            depth -= 1
+        if char == ',' and depth == 0:
+            fields.append(current)
+            current = ''
+        else:
+            current += char
+    if current:
+        fields.append(current)
+    return fields
+
+
+def make_handler(state):
+    class GraphHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _respond(self, method):
+            if state.latency_ms:
+                time.sleep(state.latency_ms / 1000)
+
+            url = urlsplit(self.path)
+            params = decode_params(dict(parse_qsl(url.query)))
+            if method == 'POST':
+                length = int(self.headers.get('Content-Length') or 0)
+                params.update(decode_params(dict(parse_qsl(self.rfile.read(length).decode('utf-8')))))
+
+            calls = len(params['batch']) if isinstance(params.get('batch'), list) else 1
+            usage = state.register_call(calls)
+            base_url = f"http://{self.headers.get('Host')}"
+
+            try:
+                if state.calls_per_hour and usage > 100:
+                    raise GraphError(400, 80000, 'There have been too many calls from this ad-account.', 2446079)
+                status, body = state.handle(method, url.path, params, base_url)
+            except GraphError as e:
+                status, body = e.status, e.body()
+
+            payload = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            for name, value in state.usage_headers(usage).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            self._respond('GET')
+
+        def do_POST(self):
+            self._respond('POST')
+
+    return GraphHandler
+
+
+def start_server(state=None, host='127.0.0.1', port=0):
+    """
+    Sobe o servidor em uma thread (para benchmarks no mesmo processo)
+
+    Returns:
+        tuple: (servidor, URL base para META_GRAPH_URL)
+    """
+    state = state or GraphStandIn()
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    server.state = state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--campaigns', type=int, default=50)
+    parser.add_argument('--adsets-per-campaign', type=int, default=2)
+    parser.add_argument('--ads-per-adset', type=int, default=2)
+    parser.add_argument('--latency-ms', type=int, default=0)
+    parser.add_argument('--calls-per-hour', type=int, default=0)
+    parser.add_argument('--report-seconds', type=float, default=3)
+    parser.add_argument('--fixtures', type=Path)
+    args = parser.parse_args()
+
+    state = GraphStandIn(
+        campaigns=args.campaigns,
+        adsets_per_campaign=args.adsets_per_campaign,
+        ads_per_adset=args.ads_per_adset,
+        latency_ms=args.latency_ms,
+        calls_per_hour=args.calls_per_hour,
+        report_seconds=args.report_seconds,
+        fixtures=args.fixtures,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    server.daemon_threads = True
+
+    print(f"🧪 Graph API local em http://{args.host}:{args.port} ({args.campaigns} campanhas)")
+    print(f"   Use META_GRAPH_URL=http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {state.requests} chamadas atendidas")
+
+
+if __name__ == '__main__':
+    main()
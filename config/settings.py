@@ -48,6 +48,24 @@ GOOGLE_SHEETS_CONFIG = {
     'spreadsheet_id': get_env('GOOGLE_SHEETS_SPREADSHEET_ID'),
     'config_tab': get_env('GOOGLE_SHEETS_CONFIG_TAB', 'Config'),
     'data_tab': get_env('GOOGLE_SHEETS_DATA_TAB', 'Dados'),
+    # Modo de escrita da aba de Dados: 'append' (sempre adiciona) ou 'upsert' (atualiza pela chave)
+    'write_mode': get_env('GOOGLE_SHEETS_WRITE_MODE', 'append').lower(),
+    # Colunas que identificam uma linha no modo upsert (separadas por vírgula)
+    'upsert_keys': [
+        key.strip() for key in get_env('GOOGLE_SHEETS_UPSERT_KEYS', 'data,plataforma,campanha').split(',')
+        if key.strip()
+    ],
+    # Cota de requisições por minuto usada pela fila de escrita (0 = sem limite)
+    'requests_per_minute': int(get_env('GOOGLE_SHEETS_REQUESTS_PER_MINUTE', '60')),
+    # A fila de escrita grava ao juntar esta quantidade de linhas...
+    'flush_rows': int(get_env('GOOGLE_SHEETS_FLUSH_ROWS', '500')),
+    # ...ou a cada este intervalo (segundos), o que vier primeiro
+    'flush_seconds': float(get_env('GOOGLE_SHEETS_FLUSH_SECONDS', '5')),
+    # Uma aba de dados por mês (ex.: Dados_2026_10), listadas na aba de manifesto
+    'partition_monthly': get_env('GOOGLE_SHEETS_PARTITION_MONTHLY', 'False').lower() == 'true',
+    'manifest_tab': get_env('GOOGLE_SHEETS_MANIFEST_TAB', 'Particoes'),
+    # Coluna de data usada nas partições e nos filtros de leitura
+    'date_column': get_env('GOOGLE_SHEETS_DATE_COLUMN', 'data'),
 }
 
 # ===========================
@@ -56,11 +74,65 @@ GOOGLE_SHEETS_CONFIG = {
 META_ADS_CONFIG = {
     'access_token': get_env('META_ACCESS_TOKEN'),
     'ad_account_id': get_env('META_AD_ACCOUNT_ID'),
+    # Endereço da Graph API (vazio = graph.facebook.com); ex.: servidor local de benchmarks
+    'graph_url': get_env('META_GRAPH_URL', ''),
+    # Várias contas (separadas por vírgula); padrão: apenas META_AD_ACCOUNT_ID
+    'ad_account_ids': [
+        aid.strip()
+        for aid in (get_env('META_AD_ACCOUNT_IDS') or get_env('META_AD_ACCOUNT_ID')).split(',')
+        if aid.strip()
+    ],
+    # Campanhas da conta principal (IDs pertencem a uma única conta)
     'campaign_ids': [
         cid.strip()
         for cid in get_env('META_CAMPAIGN_IDS', '').split(',')
         if cid.strip()
     ],
+    # Filtros aplicados na própria API: status efetivos aceitos e trechos de nome (separados por vírgula)
+    'campaign_statuses': [
+        status.strip()
+        for status in get_env('META_CAMPAIGN_STATUSES', '').split(',')
+        if status.strip()
+    ],
+    'campaign_name_patterns': [
+        pattern.strip()
+        for pattern in get_env('META_CAMPAIGN_NAME_CONTAINS', '').split(',')
+        if pattern.strip()
+    ],
+    # Conjuntos de breakdowns do cubo (conjuntos separados por ';', breakdowns do conjunto por ',')
+    'cube_breakdowns': [
+        [breakdown.strip() for breakdown in group.split(',') if breakdown.strip()]
+        for group in get_env(
+            'META_CUBE_BREAKDOWNS',
+            'impression_device;publisher_platform,platform_position;age,gender;region'
+        ).split(';')
+        if group.strip()
+    ],
+    # Acima desta estimativa de linhas, get_insights usa relatório assíncrono (AdReportRun)
+    'async_row_threshold': int(get_env('META_ASYNC_ROW_THRESHOLD', '5000')),
+    # Tempo máximo (segundos) aguardando um relatório assíncrono
+    'async_timeout': int(get_env('META_ASYNC_TIMEOUT', '600')),
+    # Divide o período em janelas de N dias coletadas em paralelo (0 = desativado)
+    'shard_window_days': int(get_env('META_SHARD_WINDOW_DAYS', '0')),
+    # Máximo de janelas coletadas ao mesmo tempo
+    'shard_workers': int(get_env('META_SHARD_WORKERS', '4')),
+    # Últimos N dias sempre recoletados na sincronização incremental (atribuição)
+    'restatement_days': int(get_env('META_RESTATEMENT_DAYS', '3')),
+    # Contas coletadas ao mesmo tempo na coleta multi-conta
+    'account_workers': int(get_env('META_ACCOUNT_WORKERS', '4')),
+    # Orçamento de chamadas por hora compartilhado por todo o app (0 = sem limite;
+    # o governador de uso abaixo já reage aos limites informados pelo Meta)
+    'rate_limit_calls_per_hour': int(get_env('META_RATE_LIMIT_CALLS_PER_HOUR', '0')),
+    # Intervalo (segundos) de atualização do painel intradiário (dados horários de hoje)
+    'intraday_refresh_seconds': int(get_env('META_INTRADAY_REFRESH_SECONDS', '300')),
+    # Conexões keep-alive mantidas com a Graph API (deve cobrir as chamadas simultâneas)
+    'http_pool_size': int(get_env('META_HTTP_POOL_SIZE', '16')),
+    # Máximo de chamadas simultâneas à Graph API (reduzido conforme o uso informado pelo Meta)
+    'max_concurrency': int(get_env('META_MAX_CONCURRENCY', '8')),
+    # Uso do limite (%) a partir do qual a concorrência cai pela metade
+    'usage_slowdown_pct': float(get_env('META_USAGE_SLOWDOWN_PCT', '75')),
+    # Uso do limite (%) a partir do qual as chamadas são pausadas
+    'usage_pause_pct': float(get_env('META_USAGE_PAUSE_PCT', '90')),
 }
 
 # ===========================
@@ -134,7 +206,7 @@ def validate_config():
     # Pelo menos uma plataforma de ads deve estar configurada
     platforms_configured = 0
 
-    if META_ADS_CONFIG['access_token'] and META_ADS_CONFIG['ad_account_id']:
+    if META_ADS_CONFIG['access_token'] and META_ADS_CONFIG['ad_account_ids']:
         platforms_configured += 1
 
     if LINKEDIN_ADS_CONFIG['access_token'] and LINKEDIN_ADS_CONFIG['ad_account_id']:
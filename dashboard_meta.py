@@ -14,7 +14,10 @@ from pathlib import Path
 # Adicionar src ao path
 sys.path.append(str(Path(__file__).resolve().parent))
 
-from src.meta_ads.client import MetaAdsClient
+from src.meta_ads.sync import InsightSync
+from src.meta_ads.registry import get_client
+from src.meta_ads.campaign_cache import CampaignCache
+from src.meta_ads.rate_limit import get_app_governor
 from config.settings import META_ADS_CONFIG
 
 # Configuração da página
@@ -135,18 +138,34 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+@st.cache_resource
+def get_meta_client():
+    """Cliente do Meta Ads (sessão HTTP e FacebookAdsApi) criado uma vez por processo"""
+    return get_client(with_store=True)
+
+
+# Perfil de campos pedido ao Meta: só as métricas usadas neste dashboard
+META_FIELD_PROFILE = 'kpi'
+
+
 @st.cache_data(ttl=3600)  # Cache por 1 hora
 def load_meta_data(days=30):
-    """Carrega dados reais do Meta Ads"""
+    """Carrega dados reais do Meta Ads (via histórico local em DATA_DIR)"""
     try:
-        client = MetaAdsClient()
+        client = get_meta_client()
 
         date_from = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
         date_to = datetime.now().strftime('%Y-%m-%d')
 
-        result = client.get_insights(date_from, date_to, level='campaign')
+        # Só busca na API os dias novos + janela de reprocessamento; o resto vem do store
+        result = InsightSync(client).sync(date_from, date_to, level='campaign', profile=META_FIELD_PROFILE)
 
         if result['success']:
+            # Status/objetivo das campanhas vêm do cache local (só campanhas alteradas são buscadas)
+            campaigns = CampaignCache(client)
+            campaigns.refresh()
+            campaigns.enrich(result['data'])
+
             df = pd.DataFrame(result['data'])
             df['date'] = pd.to_datetime(df['date'])
             return df, None
@@ -530,6 +549,15 @@ def main():
     **Última atualização:** {datetime.now().strftime('%H:%M:%S')}
     """)
 
+    # Uso do limite de chamadas da Graph API (cabeçalhos x-app-usage / x-business-use-case-usage)
+    api_usage = get_app_governor().metrics()
+    st.sidebar.metric(
+        "Uso do limite da API",
+        f"{api_usage['usage_pct']:.0f}%",
+        help=f"Concorrência atual: {api_usage['concurrency']}/{api_usage['max_concurrency']} · "
+             f"chamadas: {api_usage['calls']} · limites atingidos: {api_usage['throttled']}"
+    )
+
 
 if __name__ == "__main__":
     main()
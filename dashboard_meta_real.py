@@ -9,7 +9,8 @@ import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parent))
-from src.meta_ads.client import MetaAdsClient
+from src.meta_ads.registry import get_client
+from config.settings import META_ADS_CONFIG
 
 # Configuração
 st.set_page_config(
@@ -110,15 +111,25 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+@st.cache_resource
+def get_meta_client():
+    """Cliente do Meta Ads (sessão HTTP e FacebookAdsApi) criado uma vez por processo"""
+    return get_client(with_store=True)
+
+
+# Perfil de campos pedido ao Meta: só as métricas usadas neste dashboard
+META_FIELD_PROFILE = 'kpi'
+
+
 @st.cache_data(ttl=600)
 def load_data(days):
     """Carrega dados REAIS do Meta"""
     try:
-        client = MetaAdsClient()
+        client = get_meta_client()
         date_from = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
         date_to = datetime.now().strftime('%Y-%m-%d')
 
-        result = client.get_daily_summary(date_from, date_to)
+        result = client.get_daily_summary(date_from, date_to, profile=META_FIELD_PROFILE)
 
         if result['success']:
             return pd.DataFrame(result['data']), None
@@ -127,6 +138,63 @@ def load_data(days):
         return None, str(e)
 
 
+@st.fragment(run_every=META_ADS_CONFIG['intraday_refresh_seconds'])
+def intraday_panel():
+    """Painel de hoje, hora a hora; só este trecho é reexecutado a cada atualização"""
+    st.markdown("## ⏱️ Hoje ao Vivo")
+
+    result = get_meta_client().get_intraday(profile=META_FIELD_PROFILE)
+
+    if not result['success']:
+        st.warning(f"⚠️ Dados horários indisponíveis: {result.get('error')}")
+        return
+
+    hourly = pd.DataFrame(result['data'])
+    if hourly.empty:
+        st.info("Ainda sem entrega hoje")
+        return
+
+    hourly = hourly.groupby('hour', as_index=False)[['spend', 'leads', 'clicks']].sum().sort_values('hour')
+    hourly['spend_acumulado'] = hourly['spend'].cumsum()
+
+    spend_today = hourly['spend'].sum()
+    leads_today = int(hourly['leads'].sum())
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(label="💰 Gasto Hoje", value=f"R$ {spend_today:,.2f}")
+    with col2:
+        st.metric(label="📋 Leads Hoje", value=f"{leads_today:,}")
+    with col3:
+        st.metric(label="💵 CPL Hoje", value=f"R$ {spend_today / leads_today:.2f}" if leads_today else "-")
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=hourly['hour'],
+        y=hourly['spend'],
+        name='Gasto na hora',
+        marker_color='#FFD700'
+    ))
+    fig.add_trace(go.Scatter(
+        x=hourly['hour'],
+        y=hourly['spend_acumulado'],
+        name='Gasto acumulado',
+        mode='lines+markers',
+        line=dict(color='#FFFFFF', width=2)
+    ))
+    fig.update_layout(
+        title="Ritmo de Gasto por Hora",
+        plot_bgcolor='#000000',
+        paper_bgcolor='#000000',
+        font=dict(color='#FFFFFF', size=12),
+        xaxis=dict(showgrid=True, gridcolor='#333333', title="Hora"),
+        yaxis=dict(showgrid=True, gridcolor='#333333', title="R$"),
+        height=350
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"Atualizado às {result['refreshed_at']}")
+
+
 def main():
     # Header
     st.markdown("""
@@ -142,6 +210,8 @@ def main():
     st.sidebar.header("🔍 Filtros")
     days = st.sidebar.selectbox("Período", [7, 15, 30], index=0, format_func=lambda x: f"Últimos {x} dias")
 
+    live_today = st.sidebar.toggle("⏱️ Hoje ao vivo", value=True)
+
     if st.sidebar.button("🔄 Atualizar Dados"):
         st.cache_data.clear()
         st.rerun()
@@ -230,6 +300,11 @@ def main():
 
     st.markdown("---")
 
+    # Painel intradiário: atualiza sozinho sem recarregar o histórico acima
+    if live_today:
+        intraday_panel()
+        st.markdown("---")
+
     # Gráficos
     st.markdown("## 📈 Gráficos")
 
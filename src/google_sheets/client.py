@@ -3,16 +3,35 @@ Cliente para integração com Google Sheets
 """
 import os
 import sys
+import re
 import json
+import math
+from collections import Counter
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 import gspread
+import pandas as pd
+from gspread.utils import (
+    DateTimeOption, Dimension, ValueRenderOption, numericise_all, rowcol_to_a1, to_records
+)
 from google.oauth2.service_account import Credentials
 
 # Adicionar o diretório raiz ao path
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
 
-from config.settings import GOOGLE_SHEETS_CONFIG, LOGS_DIR
+from config.settings import GOOGLE_SHEETS_CONFIG, DATA_DIR, LOGS_DIR
+from src.google_sheets.columns import columns_to_frame
+from src.google_sheets.rate_limit import get_sheets_quota
+
+
+class WriteResult(dict):
+    """
+    Resultado de write_metrics: dicionário com as contagens que também vale
+    como booleano (True se gravou), compatível com o antigo retorno True/False
+    """
+
+    def __bool__(self):
+        return bool(self.get('success'))
 
 
 class GoogleSheetsClient:
@@ -24,11 +43,19 @@ class GoogleSheetsClient:
         'https://www.googleapis.com/auth/drive'
     ]
 
+    # Colunas da aba de manifesto das partições mensais
+    MANIFEST_HEADERS = ['aba', 'mes', 'linhas', 'atualizado_em']
+
     def __init__(self):
         self.spreadsheet_id = GOOGLE_SHEETS_CONFIG['spreadsheet_id']
         self.config_tab = GOOGLE_SHEETS_CONFIG['config_tab']
         self.data_tab = GOOGLE_SHEETS_CONFIG['data_tab']
         self.credentials_file = GOOGLE_SHEETS_CONFIG['credentials_file']
+        self.write_mode = GOOGLE_SHEETS_CONFIG['write_mode']
+        self.upsert_keys = GOOGLE_SHEETS_CONFIG['upsert_keys']
+        self.partition_monthly = GOOGLE_SHEETS_CONFIG['partition_monthly']
+        self.manifest_tab = GOOGLE_SHEETS_CONFIG['manifest_tab']
+        self.date_column = GOOGLE_SHEETS_CONFIG['date_column']
 
         if not self.spreadsheet_id:
             raise ValueError("GOOGLE_SHEETS_SPREADSHEET_ID não configurado")
@@ -38,6 +65,10 @@ class GoogleSheetsClient:
 
         self.client = None
         self.spreadsheet = None
+        # Índice chave -> linha por aba, usado no modo upsert
+        self._row_index = {}
+        # Manifesto das partições mensais (carregado no primeiro uso)
+        self._manifest = None
         self._authenticate()
 
     def _authenticate(self):
@@ -49,6 +80,8 @@ class GoogleSheetsClient:
             )
 
             self.client = gspread.authorize(credentials)
+            # Todas as requisições do processo contam na mesma cota do Sheets
+            get_sheets_quota().install(self.client)
             self.spreadsheet = self.client.open_by_key(self.spreadsheet_id)
 
             print(f"✅ Conectado ao Google Sheets: {self.spreadsheet.title}")
@@ -124,7 +157,7 @@ class GoogleSheetsClient:
             print(f"❌ Erro ao criar aba de config: {e}")
             return []
 
-    def write_metrics(self, data):
+    def write_metrics(self, data, mode=None, key_columns=None):
         """
         Escreve métricas na aba de Dados
 
@@ -141,86 +174,691 @@ class GoogleSheetsClient:
                         ...
                     }
                 ]
+            mode (str): 'append' (adiciona no final) ou 'upsert' (atualiza as linhas
+                com a mesma chave e adiciona só as novas). Padrão: GOOGLE_SHEETS_WRITE_MODE
+            key_columns (list): Colunas da chave no modo upsert. Padrão: GOOGLE_SHEETS_UPSERT_KEYS
+
+        Com partições mensais, cada mês é gravado e registrado no manifesto
+        antes do próximo. Uma falha no meio não desfaz os meses já gravados: o
+        resultado de erro traz em 'partitions' as abas gravadas e em 'pending'
+        as linhas que faltam, para repetir só elas.
 
         Returns:
-            bool: True se sucesso, False caso contrário
+            WriteResult: {'success', 'inserted', 'updated', 'unchanged'} ou
+                {'success': False, 'error'} (mais 'partitions'/'pending' com
+                partições). Antes era um bool; o resultado continua valendo
+                como booleano (if client.write_metrics(...) segue funcionando),
+                mas `is True`/`== True` deixam de valer
         """
         if not data:
             print("⚠️  Nenhum dado para escrever")
-            return False
+            return WriteResult(success=False, error='Nenhum dado para escrever')
+
+        mode = mode or self.write_mode
+        if mode not in ('append', 'upsert'):
+            raise ValueError(f"Modo de escrita desconhecido: '{mode}'. Use 'append' ou 'upsert'")
+
+        if self.partition_monthly:
+            return self._write_partitions(data, mode, key_columns)
 
         try:
-            worksheet = self._get_or_create_data_tab()
-
-            # Obter cabeçalhos existentes ou criar novos
-            existing_headers = worksheet.row_values(1)
-
-            if not existing_headers:
-                # Primeira vez - criar cabeçalhos baseado nos dados
-                headers = list(data[0].keys())
-                worksheet.update('A1', [headers])
-                worksheet.format('A1:Z1', {
-                    'textFormat': {'bold': True},
-                    'backgroundColor': {'red': 0.9, 'green': 0.6, 'blue': 0.2}
-                })
-                existing_headers = headers
-
-            # Preparar linhas para inserir
-            rows_to_insert = []
-            for item in data:
-                row = [item.get(header, '') for header in existing_headers]
-                rows_to_insert.append(row)
-
-            # Adicionar no final da planilha
-            worksheet.append_rows(rows_to_insert)
-
-            print(f"✅ {len(rows_to_insert)} linhas adicionadas à aba '{self.data_tab}'")
-            return True
+            return WriteResult(self._write_rows(self._get_or_create_data_tab(), data, mode, key_columns))
 
         except Exception as e:
             print(f"❌ Erro ao escrever métricas: {e}")
-            self._log_error({'error': str(e), 'data_count': len(data)})
+            self._log_error({'error': str(e), 'data_count': len(data), 'mode': mode})
+            return WriteResult(success=False, error=str(e))
+
+    def _write_partitions(self, data, mode, key_columns):
+        """Grava cada mês na sua aba (Dados_2026_10) e registra no manifesto logo em seguida"""
+        # Linhas sem data válida ficam na aba base
+        partitions = {}
+        for item in data:
+            partitions.setdefault(self._partition_of(item.get(self.date_column)), []).append(item)
+
+        totals = WriteResult(success=True, inserted=0, updated=0, unchanged=0, partitions=[])
+        months = sorted(partitions, key=lambda month: month or '')
+
+        for position, month in enumerate(months):
+            title = self._partition_title(month)
+            try:
+                result = self._write_rows(self._get_or_create_data_tab(title), partitions[month], mode, key_columns)
+            except Exception as e:
+                pending = [row for later in months[position:] for row in partitions[later]]
+                print(f"❌ Erro ao escrever métricas na aba '{title}': {e} ({len(pending)} linhas pendentes)")
+                self._log_error({'error': str(e), 'data_count': len(data), 'mode': mode, 'tab': title})
+                return WriteResult(
+                    success=False, error=str(e),
+                    partitions=totals['partitions'], pending=pending,
+                    **{name: totals[name] for name in ('inserted', 'updated', 'unchanged')}
+                )
+
+            for name in ('inserted', 'updated', 'unchanged'):
+                totals[name] += result[name]
+            totals['partitions'].append(title)
+            self._record_partition(title, month, result['inserted'])
+
+        return totals
+
+    def _record_partition(self, title, month, inserted):
+        """Soma as linhas novas da aba ao manifesto e o regrava (falha aqui só gera aviso)"""
+        try:
+            entry = self._load_manifest().setdefault(title, {'mes': month.replace('_', '-') if month else '', 'linhas': 0})
+            entry['linhas'] = int(entry['linhas'] or 0) + inserted
+            entry['atualizado_em'] = datetime.now().isoformat(timespec='seconds')
+            self._save_manifest()
+        except Exception as e:
+            # As linhas já estão na aba: a contagem vai junto na próxima gravação do manifesto
+            print(f"⚠️  Manifesto '{self.manifest_tab}' não atualizado: {e}")
+
+    def _write_rows(self, worksheet, data, mode, key_columns):
+        """Grava as linhas em uma aba (append ou upsert) e devolve as contagens"""
+        headers = self._ensure_headers(worksheet, data)
+
+        if mode == 'upsert':
+            return self._upsert_rows(worksheet, headers, data, key_columns or self.upsert_keys)
+
+        # Preparar linhas para inserir
+        rows_to_insert = []
+        for item in data:
+            row = [item.get(header, '') for header in headers]
+            rows_to_insert.append(row)
+
+        # Adicionar no final da planilha
+        worksheet.append_rows(rows_to_insert)
+        # O índice de chaves não conhece as linhas novas
+        self._row_index.pop(worksheet.title, None)
+
+        print(f"✅ {len(rows_to_insert)} linhas adicionadas à aba '{worksheet.title}'")
+        return {'success': True, 'inserted': len(rows_to_insert), 'updated': 0, 'unchanged': 0}
+
+    @staticmethod
+    def _partition_of(value):
+        """Mês da linha no formato 'YYYY_MM' (None se a data não for reconhecida)"""
+        if hasattr(value, 'strftime'):
+            return value.strftime('%Y_%m')
+        match = re.match(r'^(\d{4})-(\d{2})', str(value or ''))
+        return f"{match.group(1)}_{match.group(2)}" if match else None
+
+    def _partition_title(self, month):
+        return f"{self.data_tab}_{month}" if month else self.data_tab
+
+    def _load_manifest(self):
+        """
+        Manifesto das partições (aba de manifesto), lido uma vez e mantido em memória
+
+        Returns:
+            dict: Nome da aba -> {'mes': 'YYYY-MM' ('' na aba base), 'linhas', 'atualizado_em'}
+        """
+        if self._manifest is None:
+            try:
+                records = self.spreadsheet.worksheet(self.manifest_tab).get_all_records()
+            except gspread.exceptions.WorksheetNotFound:
+                records = []
+
+            self._manifest = {
+                record['aba']: {
+                    'mes': str(record.get('mes', '')),
+                    'linhas': record.get('linhas') or 0,
+                    'atualizado_em': record.get('atualizado_em', ''),
+                }
+                for record in records if record.get('aba')
+            }
+
+        return self._manifest
+
+    def _save_manifest(self):
+        """Regrava a aba de manifesto (uma chamada)"""
+        try:
+            worksheet = self.spreadsheet.worksheet(self.manifest_tab)
+        except gspread.exceptions.WorksheetNotFound:
+            print(f"📝 Criando aba '{self.manifest_tab}'...")
+            worksheet = self.spreadsheet.add_worksheet(title=self.manifest_tab, rows=200, cols=len(self.MANIFEST_HEADERS))
+            worksheet.format('A1:D1', {
+                'textFormat': {'bold': True},
+                'backgroundColor': {'red': 0.6, 'green': 0.6, 'blue': 0.6}
+            })
+
+        entries = sorted(self._manifest.items(), key=lambda item: (item[1]['mes'], item[0]))
+        worksheet.update('A1', [self.MANIFEST_HEADERS] + [
+            [title, entry['mes'], entry['linhas'], entry.get('atualizado_em', '')]
+            for title, entry in entries
+        ])
+
+    def _data_tabs(self, date_from=None, date_to=None):
+        """
+        Abas de dados que podem ter linhas no intervalo
+
+        Sem partições é sempre a aba de Dados. Com partições, a aba base (linhas
+        sem data e histórico anterior às partições, ver migrate_to_partitions)
+        mais os meses do manifesto que cruzam o intervalo.
+        """
+        if not self.partition_monthly:
+            return [self.data_tab]
+
+        first = (date_from or '')[:7]
+        last = (date_to or '9999-12')[:7]
+        tabs = [self.data_tab]
+        for title, entry in sorted(self._load_manifest().items(), key=lambda item: (item[1]['mes'], item[0])):
+            month = entry['mes']
+            if month and first <= month <= last:
+                tabs.append(title)
+        return tabs
+
+    def _open_data_tab(self, title):
+        """Aba de dados para leitura (None se não existir)"""
+        try:
+            return self.spreadsheet.worksheet(title)
+        except gspread.exceptions.WorksheetNotFound:
+            # Com partições, a aba base pode simplesmente não existir
+            if not (self.partition_monthly and title == self.data_tab):
+                print(f"⚠️  Aba '{title}' não encontrada")
+            return None
+
+    def migrate_to_partitions(self):
+        """
+        Move as linhas da aba base para as partições mensais
+
+        As linhas com data vão para a aba do mês (registradas no manifesto); as
+        sem data continuam na aba base. Valores são lidos sem formatação para
+        que números continuem números.
+
+        Pode ser executada de novo depois de uma falha: a aba base só é limpa
+        no final, e linhas que já estão na partição (mesmos valores) não são
+        copiadas outra vez.
+
+        Returns:
+            dict: {'success', 'moved', 'kept', 'partitions'} ou {'success': False, 'error'}
+        """
+        try:
+            worksheet = self.spreadsheet.worksheet(self.data_tab)
+            values = worksheet.get_values(value_render_option=ValueRenderOption.unformatted)
+            if len(values) < 2:
+                return {'success': True, 'moved': 0, 'kept': 0, 'partitions': []}
+
+            headers = values[0]
+            if self.date_column not in headers:
+                raise ValueError(f"Coluna de data '{self.date_column}' ausente na aba '{self.data_tab}'")
+
+            position = headers.index(self.date_column)
+            partitions, kept = {}, []
+            for row in values[1:]:
+                row = (row + [''] * len(headers))[:len(headers)]
+                date = self._cell_date(row[position])
+                month = self._partition_of(date)
+                if month:
+                    # Datas seriais viram texto 'YYYY-MM-DD', como grava write_metrics
+                    if hasattr(date, 'strftime'):
+                        row[position] = date.strftime('%Y-%m-%d')
+                    partitions.setdefault(month, []).append(dict(zip(headers, row)))
+                else:
+                    kept.append(row)
+
+            copied = 0
+            for month, rows in sorted(partitions.items()):
+                title = self._partition_title(month)
+                target = self._get_or_create_data_tab(title)
+
+                # Migração interrompida antes: descarta o que já foi copiado
+                existing = self._existing_rows(target, headers)
+                missing = []
+                for row in rows:
+                    key = tuple(row[header] for header in headers)
+                    if existing[key]:
+                        existing[key] -= 1
+                    else:
+                        missing.append(row)
+
+                if missing:
+                    result = self._write_rows(target, missing, 'append', None)
+                    copied += result['inserted']
+                    self._record_partition(title, month, result['inserted'])
+
+            # A aba base fica só com o cabeçalho e as linhas sem data
+            worksheet.clear()
+            worksheet.update('A1', [headers] + kept)
+            self._row_index.pop(worksheet.title, None)
+            self._drop_read_cache(worksheet.title)
+
+            moved = sum(len(rows) for rows in partitions.values())
+            print(
+                f"📦 {moved} linhas movidas para {len(partitions)} partições "
+                f"({moved - copied} já estavam lá), {len(kept)} mantidas em '{self.data_tab}'"
+            )
+            return {
+                'success': True,
+                'moved': moved,
+                'kept': len(kept),
+                'partitions': [self._partition_title(month) for month in sorted(partitions)],
+            }
+
+        except Exception as e:
+            print(f"❌ Erro ao migrar para partições: {e}")
+            self._log_error({'error': str(e), 'action': 'migrate_to_partitions'})
+            return {'success': False, 'error': str(e)}
+
+    @staticmethod
+    def _existing_rows(worksheet, headers):
+        """Linhas da aba (sem formatação) na ordem de headers, contadas por valor"""
+        values = worksheet.get_values(value_render_option=ValueRenderOption.unformatted)
+        if len(values) < 2:
+            return Counter()
+
+        tab_headers = values[0]
+        return Counter(
+            tuple(record.get(header, '') for header in headers)
+            for record in (dict(zip(tab_headers, row + [''] * len(tab_headers))) for row in values[1:])
+        )
+
+    @staticmethod
+    def _cell_date(value):
+        """Data de uma célula sem formatação (número de série ou texto 'YYYY-MM-DD')"""
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return datetime(1899, 12, 30) + timedelta(days=value)
+        return value
+
+    @classmethod
+    def _in_range(cls, value, date_from, date_to):
+        value = cls._cell_date(value)
+        day = value.strftime('%Y-%m-%d') if hasattr(value, 'strftime') else str(value or '')[:10]
+        if not re.match(r'^\d{4}-\d{2}-\d{2}$', day):
             return False
+        return (not date_from or day >= date_from) and (not date_to or day <= date_to)
+
+    def _ensure_headers(self, worksheet, data):
+        """Cabeçalhos da aba; na primeira escrita são criados a partir dos dados"""
+        index = self._row_index.get(worksheet.title)
+        if index:
+            return index['headers']
+
+        # Obter cabeçalhos existentes ou criar novos
+        existing_headers = worksheet.row_values(1)
+
+        if not existing_headers:
+            # Primeira vez - criar cabeçalhos baseado nos dados
+            headers = list(data[0].keys())
+            worksheet.update('A1', [headers])
+            worksheet.format('A1:Z1', {
+                'textFormat': {'bold': True},
+                'backgroundColor': {'red': 0.9, 'green': 0.6, 'blue': 0.2}
+            })
+            existing_headers = headers
+
+        return existing_headers
+
+    def _load_row_index(self, worksheet, key_columns):
+        """
+        Índice chave -> número da linha da aba, lido uma vez e mantido em memória
 
-    def _get_or_create_data_tab(self):
-        """Obtém ou cria a aba de dados"""
+        Returns:
+            dict: {'headers', 'key_columns', 'rows': {chave: (linha, valores)}, 'next_row'}
+        """
+        index = self._row_index.get(worksheet.title)
+        if index and index['key_columns'] == key_columns:
+            return index
+
+        # Valores sem formatação: números voltam como números e a comparação
+        # com os dados novos não depende do formato da célula
+        values = worksheet.get_values(value_render_option=ValueRenderOption.unformatted)
+        headers = values[0] if values else []
+
+        missing = [name for name in key_columns if name not in headers]
+        if missing:
+            raise ValueError(f"Colunas da chave ausentes no cabeçalho: {', '.join(missing)}")
+
+        positions = [headers.index(name) for name in key_columns]
+        rows = {}
+        for row_number, row in enumerate(values[1:], start=2):
+            row = row + [''] * (len(headers) - len(row))
+            key = self._row_key(row[position] for position in positions)
+            if any(key):
+                rows[key] = (row_number, row[:len(headers)])
+
+        index = {
+            'headers': headers,
+            'key_columns': key_columns,
+            'rows': rows,
+            'next_row': len(values) + 1,
+        }
+        self._row_index[worksheet.title] = index
+        return index
+
+    @staticmethod
+    def _row_key(values):
+        return tuple('' if value is None else str(value).strip() for value in values)
+
+    @staticmethod
+    def _cell(value):
+        """Valor normalizado para comparar o que está na planilha com o dado novo"""
+        if value is None or value == '':
+            return ''
+        if isinstance(value, bool):
+            return str(value).upper()
         try:
-            return self.spreadsheet.worksheet(self.data_tab)
+            number = float(value)
+        except (TypeError, ValueError):
+            return str(value)
+        return round(number, 9) if math.isfinite(number) else str(value)
+
+    def _upsert_rows(self, worksheet, headers, data, key_columns):
+        """Atualiza as linhas com chave existente (um batch_update) e adiciona as novas"""
+        index = self._load_row_index(worksheet, list(key_columns))
+        headers = index['headers'] or headers
+
+        # Última ocorrência de cada chave vence
+        incoming = {}
+        for item in data:
+            row = ['' if item.get(header) is None else item.get(header, '') for header in headers]
+            incoming[self._row_key(item.get(name) for name in key_columns)] = row
+
+        updates, new_rows, unchanged = [], [], 0
+        for key, row in incoming.items():
+            current = index['rows'].get(key)
+            if current is None:
+                new_rows.append((key, row))
+            elif [self._cell(value) for value in current[1]] == [self._cell(value) for value in row]:
+                unchanged += 1
+            else:
+                updates.append((key, current[0], row))
+
+        if updates:
+            worksheet.batch_update([
+                {'range': f"A{row_number}:{rowcol_to_a1(row_number, len(headers))}", 'values': [row]}
+                for _, row_number, row in updates
+            ])
+            for key, row_number, row in updates:
+                index['rows'][key] = (row_number, row)
+            # Linhas antigas mudaram: o cache de leitura precisa ser refeito
+            self._drop_read_cache(worksheet.title)
+
+        if new_rows:
+            response = worksheet.append_rows([row for _, row in new_rows])
+            first_row = self._appended_first_row(response) or index['next_row']
+            for offset, (key, row) in enumerate(new_rows):
+                index['rows'][key] = (first_row + offset, row)
+            index['next_row'] = first_row + len(new_rows)
+
+        print(
+            f"✅ Aba '{worksheet.title}': {len(new_rows)} inseridas, "
+            f"{len(updates)} atualizadas, {unchanged} sem alteração"
+        )
+        return {
+            'success': True,
+            'inserted': len(new_rows),
+            'updated': len(updates),
+            'unchanged': unchanged,
+        }
+
+    @staticmethod
+    def _appended_first_row(response):
+        """Primeira linha escrita por append_rows (ex.: updatedRange 'Dados!A11:F12' -> 11)"""
+        updated_range = (response or {}).get('updates', {}).get('updatedRange', '')
+        match = re.search(r'![A-Z]+(\d+)', updated_range)
+        return int(match.group(1)) if match else None
+
+    def _get_or_create_data_tab(self, title=None):
+        """Obtém ou cria a aba de dados (ou uma partição mensal dela)"""
+        title = title or self.data_tab
+        try:
+            return self.spreadsheet.worksheet(title)
         except gspread.exceptions.WorksheetNotFound:
-            print(f"📝 Criando aba '{self.data_tab}'...")
+            print(f"📝 Criando aba '{title}'...")
             return self.spreadsheet.add_worksheet(
-                title=self.data_tab,
+                title=title,
                 rows=1000,
                 cols=20
             )
 
-    def read_all_data(self):
+    def read_all_data(self, cached=True, incremental=False, date_from=None, date_to=None):
         """
         Lê todos os dados da aba de Dados
 
+        Com cache, o resultado fica em disco (DATA_DIR/google_sheets) junto com o
+        cabeçalho, o número de linhas lidas e a revisão da planilha (lastUpdateTime
+        do Drive). Revisão igual devolve o cache sem ler valores; revisão diferente
+        (ou indisponível) faz a leitura completa.
+
+        incremental=True é para abas só de acréscimo (append): quando a revisão
+        muda, lê apenas o cabeçalho, a última linha conhecida e as linhas novas do
+        final, e só relê tudo se o cabeçalho ou a última linha mudarem. Edições em
+        linhas antigas (upserts de outra máquina, edição manual) não são
+        detectadas nesse modo.
+
+        Com partições mensais (GOOGLE_SHEETS_PARTITION_MONTHLY), só as abas dos
+        meses que cruzam o filtro de data são lidas.
+
+        Args:
+            cached (bool): Usar o cache local validado pela revisão da planilha
+            incremental (bool): Ler só as linhas novas quando a revisão mudar (abas append-only)
+            date_from (str): Data inicial 'YYYY-MM-DD' (inclusiva, opcional)
+            date_to (str): Data final 'YYYY-MM-DD' (inclusiva, opcional)
+
         Returns:
             list: Lista de dicionários com todos os dados
         """
         try:
-            worksheet = self.spreadsheet.worksheet(self.data_tab)
-            records = worksheet.get_all_records()
+            records = []
+            for title in self._data_tabs(date_from, date_to):
+                worksheet = self._open_data_tab(title)
+                if worksheet is None:
+                    continue
+
+                if cached or incremental:
+                    tab_records, fetched = self._read_cached(worksheet, tail=incremental)
+                    print(
+                        f"📖 {len(tab_records)} registros da aba '{title}' "
+                        f"({fetched} lidos da planilha)"
+                    )
+                else:
+                    tab_records = worksheet.get_all_records()
+                    print(f"📖 {len(tab_records)} registros lidos da aba '{title}'")
+
+                records.extend(tab_records)
+
+            if date_from or date_to:
+                records = [
+                    record for record in records
+                    if self._in_range(record.get(self.date_column), date_from, date_to)
+                ]
 
-            print(f"📖 {len(records)} registros lidos da aba '{self.data_tab}'")
             return records
 
-        except gspread.exceptions.WorksheetNotFound:
-            print(f"⚠️  Aba '{self.data_tab}' não encontrada")
-            return []
         except Exception as e:
             print(f"❌ Erro ao ler dados: {e}")
             return []
 
+    def read_columns(self, columns=None, date_columns=None, date_from=None, date_to=None):
+        """
+        Lê a aba de Dados direto em colunas tipadas (DataFrame)
+
+        Busca só as colunas pedidas, em uma chamada batch_get, com valores sem
+        formatação e datas como número de série. Números viram int64/float64 e
+        datas datetime64, sem passar por um dicionário por linha.
+
+        Args:
+            columns (list): Colunas desejadas (padrão: todas)
+            date_columns (iterable): Colunas convertidas em datetime64
+                (padrão: a coluna de data configurada, GOOGLE_SHEETS_DATE_COLUMN)
+            date_from (str): Data inicial 'YYYY-MM-DD' (inclusiva, opcional)
+            date_to (str): Data final 'YYYY-MM-DD' (inclusiva, opcional)
+
+        Returns:
+            pd.DataFrame: Dados tipados (vazio se a aba não existir ou houver erro)
+        """
+        if date_columns is None:
+            date_columns = (self.date_column,)
+
+        filtered = bool(date_from or date_to)
+        if filtered and columns and self.date_column not in columns:
+            columns = list(columns) + [self.date_column]
+
+        try:
+            frames = []
+            for title in self._data_tabs(date_from, date_to):
+                worksheet = self._open_data_tab(title)
+                if worksheet is None:
+                    continue
+
+                frame = self._read_tab_columns(worksheet, columns, date_columns)
+                if not frame.empty:
+                    frames.append(frame)
+
+            if not frames:
+                return pd.DataFrame()
+
+            frame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+            if filtered and self.date_column in frame.columns:
+                dates = pd.to_datetime(frame[self.date_column], errors='coerce')
+                mask = dates.notna()
+                if date_from:
+                    mask &= dates >= pd.Timestamp(date_from)
+                if date_to:
+                    mask &= dates < pd.Timestamp(date_to) + pd.Timedelta(days=1)
+                frame = frame[mask].reset_index(drop=True)
+
+            return frame
+
+        except Exception as e:
+            print(f"❌ Erro ao ler colunas: {e}")
+            return pd.DataFrame()
+
+    def _read_tab_columns(self, worksheet, columns, date_columns):
+        """Colunas tipadas de uma aba (cabeçalho + um batch_get)"""
+        headers = worksheet.row_values(1)
+
+        selected = [name for name in (columns or headers) if name in headers]
+        missing = [name for name in (columns or []) if name not in headers]
+        if missing:
+            print(f"⚠️  Colunas ausentes na aba '{worksheet.title}': {', '.join(missing)}")
+        if not selected:
+            return pd.DataFrame()
+
+        ranges = []
+        for name in selected:
+            letter = rowcol_to_a1(1, headers.index(name) + 1).rstrip('0123456789')
+            ranges.append(f"{letter}2:{letter}")
+
+        results = worksheet.batch_get(
+            ranges,
+            major_dimension=Dimension.cols,
+            value_render_option=ValueRenderOption.unformatted,
+            date_time_render_option=DateTimeOption.serial_number,
+        )
+        values = [result[0] if result else [] for result in results]
+        size = max((len(column) for column in values), default=0)
+
+        frame = columns_to_frame(selected, values, size, date_columns)
+        print(f"📖 {size} registros ({len(selected)} colunas) lidos da aba '{worksheet.title}'")
+        return frame
+
+    def _read_cache_path(self, title):
+        return DATA_DIR / 'google_sheets' / f"{self.spreadsheet_id}_{title}.json"
+
+    def _drop_read_cache(self, title):
+        """Descarta o cache de leitura (linhas antigas foram alteradas por este cliente)"""
+        self._read_cache_path(title).unlink(missing_ok=True)
+
+    def _revision(self):
+        """Revisão da planilha (modifiedTime do Drive); None se indisponível"""
+        try:
+            return self.spreadsheet.get_lastUpdateTime()
+        except Exception:
+            return None
+
+    @staticmethod
+    def _to_records(headers, rows):
+        """Linhas -> dicionários, com a mesma conversão numérica de get_all_records"""
+        width = len(headers)
+        return to_records(headers, [
+            numericise_all((row + [''] * width)[:width], default_blank='')
+            for row in rows
+        ])
+
+    def _read_cached(self, worksheet, tail=False):
+        """
+        Leitura com cache local validado pela revisão da planilha
+
+        Args:
+            tail (bool): Com revisão nova, buscar só o final da aba (abas append-only)
+
+        Returns:
+            tuple: (registros, linhas lidas da planilha nesta chamada)
+        """
+        path = self._read_cache_path(worksheet.title)
+        revision = self._revision()
+
+        cache = None
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+            except (OSError, ValueError):
+                cache = None
+
+        if cache and revision and cache.get('revision') == revision:
+            return cache['records'], 0
+
+        if tail and cache and cache.get('headers'):
+            seen = cache['row_count']
+            ranges = ['1:1', f"{seen + 2}:{max(worksheet.row_count, seen + 2)}"]
+            if seen:
+                ranges.insert(1, f"{seen + 1}:{seen + 1}")
+
+            results = worksheet.batch_get(ranges)
+            headers = results[0][0] if results[0] else []
+            tail = [list(row) for row in results[-1]]
+
+            unchanged_boundary = True
+            if seen:
+                boundary = results[1][0] if results[1] else []
+                unchanged_boundary = self._to_records(headers, [boundary]) == cache['records'][-1:]
+
+            if headers == cache['headers'] and unchanged_boundary:
+                records = cache['records'] + self._to_records(headers, tail)
+                self._save_read_cache(path, headers, records, seen + len(tail), revision)
+                return records, len(tail)
+
+            print(f"🔄 Aba '{worksheet.title}' alterada desde a última leitura, lendo tudo")
+
+        # Revisão nova: as linhas antigas podem ter mudado, então a leitura é completa
+        values = worksheet.get_values()
+        headers = values[0] if values else []
+        records = self._to_records(headers, values[1:])
+        self._save_read_cache(path, headers, records, len(values) - 1 if values else 0, revision)
+        return records, len(records)
+
+    @staticmethod
+    def _save_read_cache(path, headers, records, row_count, revision):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                'headers': headers,
+                'row_count': row_count,
+                'revision': revision,
+                'records': records,
+            }, f, ensure_ascii=False)
+        tmp.replace(path)
+
     def clear_data_tab(self):
-        """Limpa todos os dados da aba (mantém cabeçalhos)"""
+        """Limpa todos os dados da aba (e das partições mensais, se houver)"""
         try:
-            worksheet = self.spreadsheet.worksheet(self.data_tab)
-            worksheet.clear()
-            print(f"🗑️  Aba '{self.data_tab}' limpa")
+            for title in self._data_tabs():
+                worksheet = self._open_data_tab(title)
+                if worksheet is None:
+                    continue
+                worksheet.clear()
+                self._row_index.pop(worksheet.title, None)
+                self._drop_read_cache(worksheet.title)
+                print(f"🗑️  Aba '{title}' limpa")
+
+            if self.partition_monthly and self._manifest:
+                for entry in self._manifest.values():
+                    entry['linhas'] = 0
+                    entry['atualizado_em'] = datetime.now().isoformat(timespec='seconds')
+                self._save_manifest()
+
             return True
         except Exception as e:
             print(f"❌ Erro ao limpar aba: {e}")
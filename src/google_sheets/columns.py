@@ -0,0 +1,103 @@
+"""
+Conversão de valores do Google Sheets em colunas tipadas
+
+Os valores chegam da API sem formatação (UNFORMATTED_VALUE) e com datas como
+número de série (SERIAL_NUMBER), uma lista por coluna (majorDimension
+COLUMNS). Cada coluna vira um array NumPy de uma vez: números em float64 ou
+int64 e datas em datetime64, sem montar um dicionário por linha como
+get_all_records.
+"""
+import numpy as np
+import pandas as pd
+
+# Dia zero das datas seriais do Sheets (mesma convenção do Excel/Lotus)
+SHEETS_EPOCH = np.datetime64('1899-12-30', 'ns')
+
+NANOSECONDS_PER_DAY = 86_400 * 10**9
+
+
+def serial_to_datetime(serials):
+    """
+    Converte datas seriais do Sheets (dias desde 1899-12-30, fração = hora) em datetime64
+
+    Args:
+        serials (np.ndarray): Números de série (NaN = vazio)
+
+    Returns:
+        np.ndarray: datetime64[ns] (NaT onde não havia data)
+    """
+    serials = np.asarray(serials, dtype=np.float64)
+    valid = np.isfinite(serials)
+    offsets = np.zeros(len(serials), dtype=np.int64)
+    offsets[valid] = np.round(serials[valid] * NANOSECONDS_PER_DAY).astype(np.int64)
+
+    result = SHEETS_EPOCH + offsets.astype('timedelta64[ns]')
+    result[~valid] = np.datetime64('NaT')
+    return result
+
+
+def _numeric_mask(values):
+    return np.fromiter(
+        (isinstance(value, (int, float)) and not isinstance(value, bool) for value in values),
+        dtype=bool,
+        count=len(values)
+    )
+
+
+def to_column(values, size, date=False):
+    """
+    Converte a lista de valores de uma coluna em um array tipado
+
+    Args:
+        values (list): Valores da coluna como vieram da API (linhas vazias do
+            final são omitidas pela API)
+        size (int): Número de linhas de dados
+        date (bool): Coluna de data (seriais ou texto 'YYYY-MM-DD')
+
+    Returns:
+        np.ndarray: int64/float64 para colunas numéricas, datetime64[ns] para
+            datas e object para texto
+    """
+    values = list(values[:size]) + [''] * (size - len(values))
+    array = np.array(values, dtype=object)
+    numeric = _numeric_mask(values)
+    blank = array == ''
+
+    if date:
+        result = np.full(size, np.datetime64('NaT'), dtype='datetime64[ns]')
+        if numeric.any():
+            result[numeric] = serial_to_datetime(array[numeric].astype(np.float64))
+        text = ~numeric & ~blank
+        if text.any():
+            # Datas gravadas como texto (escritas com RAW) ficam como string na planilha
+            result[text] = pd.to_datetime(array[text].astype(str), errors='coerce').to_numpy()
+        return result
+
+    if (numeric | blank).all() and numeric.any():
+        numbers = np.full(size, np.nan)
+        numbers[numeric] = array[numeric].astype(np.float64)
+        if not blank.any() and np.array_equal(numbers, np.trunc(numbers)):
+            return numbers.astype(np.int64)
+        return numbers
+
+    return array
+
+
+def columns_to_frame(headers, columns, size, date_columns=()):
+    """
+    Monta um DataFrame a partir das colunas lidas da planilha
+
+    Args:
+        headers (list): Nome de cada coluna
+        columns (list): Lista de valores de cada coluna (mesma ordem de headers)
+        size (int): Número de linhas de dados
+        date_columns (iterable): Colunas convertidas em datetime64
+
+    Returns:
+        pd.DataFrame: Uma coluna tipada por cabeçalho
+    """
+    date_columns = set(date_columns)
+    return pd.DataFrame({
+        header: to_column(values, size, date=header in date_columns)
+        for header, values in zip(headers, columns)
+    })
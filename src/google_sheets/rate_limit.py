@@ -0,0 +1,113 @@
+"""
+Controle de taxa das requisições ao Google Sheets
+
+A cota do Sheets é por projeto e por usuário (padrão: 60 requisições por
+minuto), então todos os GoogleSheetsClient do processo compartilham um único
+token bucket, instalado no cliente HTTP do gspread ao autenticar.
+"""
+import sys
+import time
+import random
+import threading
+from pathlib import Path
+from gspread.exceptions import APIError
+
+# Adicionar o diretório raiz ao path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from config.settings import GOOGLE_SHEETS_CONFIG
+
+
+class RequestQuota:
+    """Token bucket de requisições por minuto, com repetição de respostas 429"""
+
+    def __init__(self, requests_per_minute, max_retries=5, base_delay=1.0, max_delay=64.0):
+        """
+        Args:
+            requests_per_minute (int): Requisições permitidas por minuto (0 = sem limite)
+            max_retries (int): Repetições de uma requisição recusada com 429
+            base_delay (float): Espera inicial (segundos) antes da primeira repetição
+            max_delay (float): Espera máxima entre repetições
+        """
+        self.requests_per_minute = requests_per_minute
+        self.capacity = float(requests_per_minute)
+        self.tokens = float(requests_per_minute)
+        self.refill_per_second = requests_per_minute / 60
+        self.updated_at = time.monotonic()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.requests = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Consome uma requisição da cota, aguardando se ela estiver esgotada"""
+        if not self.requests_per_minute:
+            with self._lock:
+                self.requests += 1
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.requests += 1
+                    return
+                wait = (1 - self.tokens) / self.refill_per_second
+
+            time.sleep(wait)
+
+    def backoff(self, attempt):
+        """Espera exponencial com jitter completo (0 até base * 2^tentativa)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def install(self, gspread_client):
+        """
+        Faz todas as requisições de um gspread.Client passarem pela cota
+
+        row_values, update, format, append_rows e batch_update usam
+        http_client.request, então cada chamada conta uma requisição.
+        """
+        http_client = gspread_client.http_client
+        if getattr(http_client, '_request_quota', None) is self:
+            return gspread_client
+
+        request = http_client.request
+
+        def quota_request(*args, **kwargs):
+            attempt = 0
+            while True:
+                self.acquire()
+                try:
+                    return request(*args, **kwargs)
+                except APIError as e:
+                    if e.response.status_code != 429 or attempt >= self.max_retries:
+                        raise
+                    with self._lock:
+                        self.throttled += 1
+                    delay = self.backoff(attempt)
+                    print(f"⏳ Cota do Google Sheets excedida (429), nova tentativa em {delay:.1f}s")
+                    time.sleep(delay)
+                    attempt += 1
+
+        http_client.request = quota_request
+        http_client._request_quota = self
+        return gspread_client
+
+
+_sheets_quota = None
+_sheets_quota_lock = threading.Lock()
+
+
+def get_sheets_quota():
+    """Cota de requisições do processo (uma por processo, GOOGLE_SHEETS_REQUESTS_PER_MINUTE)"""
+    global _sheets_quota
+
+    with _sheets_quota_lock:
+        if _sheets_quota is None:
+            _sheets_quota = RequestQuota(GOOGLE_SHEETS_CONFIG['requests_per_minute'])
+        return _sheets_quota
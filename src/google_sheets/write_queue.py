@@ -0,0 +1,200 @@
+"""
+Fila de escrita (write-behind) para a aba de Dados do Google Sheets
+
+Os coletores chamam put() e seguem em frente; uma thread de fundo junta as
+linhas de todos os produtores e grava em lotes grandes com
+GoogleSheetsClient.write_metrics. As requisições passam pela cota
+compartilhada do processo (src/google_sheets/rate_limit.py), com repetição
+de respostas 429. Lotes que falham são repetidos com espera exponencial,
+reenviando só as linhas ainda não gravadas (write_metrics devolve as
+pendentes em 'pending'); se ainda assim falharem, só essas são salvas em
+DATA_DIR/google_sheets para nova tentativa (requeue_saved). O que estiver na fila é gravado ao encerrar o
+processo (atexit).
+"""
+import sys
+import json
+import time
+import atexit
+import threading
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from config.settings import GOOGLE_SHEETS_CONFIG, DATA_DIR
+from src.google_sheets.client import GoogleSheetsClient
+from src.google_sheets.rate_limit import get_sheets_quota
+
+
+class SheetsWriteQueue:
+    """Buffer de linhas gravadas em lotes por uma thread de fundo"""
+
+    # Linhas por chamada de write_metrics (mantém o corpo da requisição pequeno)
+    MAX_ROWS_PER_WRITE = 10_000
+
+    # Repetições de um lote que falhou, com espera exponencial entre elas
+    MAX_WRITE_RETRIES = 3
+
+    def __init__(self, client, flush_rows=None, flush_seconds=None, mode=None, failed_file=None):
+        """
+        Args:
+            client (GoogleSheetsClient): Cliente usado nas gravações
+            flush_rows (int): Linhas acumuladas que disparam uma gravação. Padrão: GOOGLE_SHEETS_FLUSH_ROWS
+            flush_seconds (float): Intervalo máximo entre gravações. Padrão: GOOGLE_SHEETS_FLUSH_SECONDS
+            mode (str): Modo de write_metrics ('append' ou 'upsert'). Padrão: GOOGLE_SHEETS_WRITE_MODE
+            failed_file (Path): Onde salvar lotes que não puderam ser gravados
+                (padrão: DATA_DIR/google_sheets/write_queue_failed.jsonl)
+        """
+        self.client = client
+        self.flush_rows = flush_rows or GOOGLE_SHEETS_CONFIG['flush_rows']
+        self.flush_seconds = flush_seconds or GOOGLE_SHEETS_CONFIG['flush_seconds']
+        self.mode = mode
+        self.failed_file = Path(failed_file) if failed_file else DATA_DIR / 'google_sheets' / 'write_queue_failed.jsonl'
+        self.quota = get_sheets_quota()
+        self.quota.install(client.client)
+
+        self.stats = {'queued': 0, 'written': 0, 'failed': 0, 'flushes': 0}
+
+        self._rows = []
+        self._pending = 0
+        self._closed = False
+        self._flush_requested = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='sheets-write-queue', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, rows):
+        """
+        Enfileira linhas para gravação (não bloqueia)
+
+        Args:
+            rows (list): Lista de dicionários no formato de write_metrics
+        """
+        if not rows:
+            return
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Fila de escrita do Google Sheets já foi encerrada")
+            self._rows.extend(rows)
+            self._pending += len(rows)
+            self.stats['queued'] += len(rows)
+            if len(self._rows) >= self.flush_rows:
+                self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                # Grava ao completar um lote, quando flush() pede ou quando o intervalo vence
+                self._condition.wait_for(
+                    lambda: len(self._rows) >= self.flush_rows or self._flush_requested or self._closed,
+                    timeout=self.flush_seconds
+                )
+                rows, self._rows = self._rows, []
+                self._flush_requested = False
+                if not rows and self._closed:
+                    return
+
+            for start in range(0, len(rows), self.MAX_ROWS_PER_WRITE):
+                self._write(rows[start:start + self.MAX_ROWS_PER_WRITE])
+
+    def _write(self, rows):
+        """Grava um lote (chamado só pela thread de fundo)"""
+        # Só o que ainda não foi gravado é repetido: com partições mensais, os
+        # meses já gravados de uma tentativa que falhou não são reenviados
+        remaining = rows
+        for attempt in range(self.MAX_WRITE_RETRIES + 1):
+            if attempt:
+                delay = self.quota.backoff(attempt)
+                print(f"⏳ Nova tentativa de {len(remaining)} linhas em {delay:.1f}s ({attempt}/{self.MAX_WRITE_RETRIES})")
+                time.sleep(delay)
+            try:
+                result = self.client.write_metrics(remaining, mode=self.mode)
+            except Exception as e:
+                print(f"❌ Erro ao gravar lote da fila: {e}")
+                result = {'success': False, 'error': str(e)}
+            if result.get('success'):
+                remaining = []
+                break
+            remaining = result.get('pending', remaining)
+        else:
+            self._save_failed(remaining)
+
+        with self._condition:
+            self.stats['flushes'] += 1
+            self.stats['written'] += len(rows) - len(remaining)
+            self.stats['failed'] += len(remaining)
+            self._pending -= len(rows)
+            self._condition.notify_all()
+
+    def _save_failed(self, rows):
+        """Salva em disco um lote que não pôde ser gravado (nada se perde ao encerrar)"""
+        self.failed_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.failed_file, 'a', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+        print(f"💾 {len(rows)} linhas não gravadas salvas em {self.failed_file}")
+
+    def requeue_saved(self):
+        """
+        Enfileira de novo as linhas salvas por falhas anteriores
+
+        Returns:
+            int: Quantidade de linhas enfileiradas
+        """
+        if not self.failed_file.exists():
+            return 0
+
+        pending = self.failed_file.with_suffix('.requeued')
+        self.failed_file.replace(pending)
+        with open(pending, encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+        self.put(rows)
+        pending.unlink()
+        return len(rows)
+
+    def flush(self, timeout=None):
+        """
+        Aguarda a gravação de tudo o que já foi enfileirado
+
+        Returns:
+            bool: True se a fila esvaziou dentro do prazo
+        """
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def close(self):
+        """Grava o que restou na fila e encerra a thread de fundo"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+
+        self._thread.join()
+        atexit.unregister(self.close)
+
+        if self.stats['queued']:
+            print(
+                f"💾 Fila do Google Sheets encerrada: {self.stats['written']} linhas gravadas "
+                f"em {self.stats['flushes']} lotes, {self.stats['failed']} salvas para nova tentativa, "
+                f"{self.quota.throttled} respostas 429"
+            )
+
+
+_write_queue = None
+_write_queue_lock = threading.Lock()
+
+
+def get_write_queue():
+    """Fila de escrita compartilhada pelo processo (criada no primeiro uso)"""
+    global _write_queue
+
+    with _write_queue_lock:
+        if _write_queue is None or _write_queue._closed:
+            _write_queue = SheetsWriteQueue(GoogleSheetsClient())
+        return _write_queue
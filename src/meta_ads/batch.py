@@ -0,0 +1,121 @@
+"""
+Requisições em lote à Graph API do Meta
+
+Agrupa até 50 chamadas (dados de conta, campanhas, insights) em uma única
+requisição HTTP com FacebookAdsApi.new_batch(). Cada chamada recebe sua
+própria resposta ou erro, na ordem em que foi adicionada.
+"""
+from functools import partial
+
+
+class GraphBatch:
+    """Fila de chamadas à Graph API executadas em lotes"""
+
+    # Limite de chamadas por requisição de lote da Graph API
+    MAX_BATCH_SIZE = 50
+
+    # Novas tentativas para chamadas que voltaram sem resposta no lote
+    MAX_RETRIES = 3
+
+    def __init__(self, api, governor=None):
+        """
+        Args:
+            api (FacebookAdsApi): Sessão da API (com orçamento/governador instalados)
+            governor (RequestGovernor): Recebe os cabeçalhos de uso de cada chamada do lote
+        """
+        self.api = api
+        self.governor = governor
+        self._calls = []
+
+    def __len__(self):
+        return len(self._calls)
+
+    def add(self, method, relative_path, params=None):
+        """
+        Adiciona uma chamada ao lote
+
+        Args:
+            method (str): Método HTTP ('GET', 'POST', ...)
+            relative_path (str): Caminho relativo (ex.: 'act_123/campaigns')
+            params (dict): Parâmetros da chamada (listas de campos são unidas por vírgula)
+
+        Returns:
+            int: Posição da chamada na lista de resultados de execute()
+        """
+        params = dict(params or {})
+        if isinstance(params.get('fields'), (list, tuple)):
+            params['fields'] = ','.join(params['fields'])
+
+        self._calls.append((method, relative_path, params))
+        return len(self._calls) - 1
+
+    def get(self, relative_path, params=None):
+        """Adiciona uma chamada GET ao lote"""
+        return self.add('GET', relative_path, params)
+
+    def execute(self):
+        """
+        Executa as chamadas pendentes, em requisições de até MAX_BATCH_SIZE
+
+        Returns:
+            list: Um resultado por chamada, na ordem de add():
+                {'success': True, 'data': <json>} ou {'success': False, 'error': str}
+        """
+        calls, self._calls = self._calls, []
+        results = [None] * len(calls)
+
+        def on_success(index, response):
+            results[index] = {'success': True, 'data': response.json()}
+            self._observe(response)
+
+        def on_failure(index, response):
+            error = response.error()
+            results[index] = {
+                'success': False,
+                'error': error.api_error_message() or str(error),
+                'code': error.api_error_code(),
+            }
+            self._observe(response)
+
+        pending = list(range(len(calls)))
+
+        for _ in range(self.MAX_RETRIES + 1):
+            if not pending:
+                break
+
+            for start in range(0, len(pending), self.MAX_BATCH_SIZE):
+                chunk = pending[start:start + self.MAX_BATCH_SIZE]
+                batch = self.api.new_batch()
+
+                for index in chunk:
+                    method, relative_path, params = calls[index]
+                    batch.add(
+                        method,
+                        relative_path,
+                        params=params,
+                        success=partial(on_success, index),
+                        failure=partial(on_failure, index),
+                    )
+
+                try:
+                    batch.execute()
+                except Exception as e:
+                    # A requisição do lote inteiro falhou: o erro vale para todas as chamadas dele
+                    for index in chunk:
+                        results[index] = {'success': False, 'error': str(e), 'code': None}
+
+            # Chamadas sem resposta (a API não processou) vão para o próximo lote
+            pending = [index for index in pending if results[index] is None]
+
+        for index in pending:
+            results[index] = {
+                'success': False,
+                'error': 'Chamada sem resposta no lote da Graph API',
+                'code': None,
+            }
+
+        return results
+
+    def _observe(self, response):
+        if self.governor:
+            self.governor.observe(response.headers())
@@ -0,0 +1,149 @@
+"""
+Cache persistente dos metadados de campanhas do Meta Ads
+
+Nomes, status e objetivos das campanhas quase nunca mudam, então ficam em
+DATA_DIR/meta_ads/campaigns.json. Cada atualização pede à API apenas as
+campanhas com updated_time posterior à última vista (filtering da Graph
+API), e as consultas por ID são feitas em um dicionário, sem nova chamada.
+"""
+import sys
+import json
+import threading
+from pathlib import Path
+from datetime import datetime
+
+# Adicionar o diretório raiz ao path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from config.settings import DATA_DIR
+
+
+class CampaignCache:
+    """Metadados de campanhas por conta, atualizados por delta de updated_time"""
+
+    # Colunas copiadas para as linhas de insights em enrich()
+    ENRICH_COLUMNS = {
+        'campaign_name': 'name',
+        'campaign_status': 'status',
+        'objective': 'objective',
+    }
+
+    def __init__(self, client, data_dir=None):
+        """
+        Args:
+            client (MetaAdsClient): Cliente usado nas atualizações (conta: client.ad_account_id)
+            data_dir (Path): Diretório do cache (padrão: DATA_DIR/meta_ads)
+        """
+        self.client = client
+        self.data_dir = Path(data_dir) if data_dir else DATA_DIR / 'meta_ads'
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_file = self.data_dir / 'campaigns.json'
+        self._accounts = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _parse_time(value):
+        """Converte o updated_time da API ('2026-01-05T10:00:00-0300') em timestamp Unix"""
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z').timestamp()
+
+    def _load(self):
+        if self._accounts is None:
+            if self.cache_file.exists():
+                with open(self.cache_file, encoding='utf-8') as f:
+                    self._accounts = json.load(f)
+            else:
+                self._accounts = {}
+        return self._accounts
+
+    def _save(self):
+        tmp = self.cache_file.with_suffix('.json.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._accounts, f, ensure_ascii=False)
+        tmp.replace(self.cache_file)
+
+    def _account(self, account_id=None):
+        account_id = account_id or self.client.ad_account_id
+        return self._load().setdefault(account_id, {
+            'updated_since': None,
+            'synced_at': None,
+            'campaigns': {},
+        })
+
+    def refresh(self, full=False):
+        """
+        Atualiza o cache da conta do cliente
+
+        Na primeira vez (ou com full=True) lista todas as campanhas; depois,
+        só as alteradas desde o maior updated_time já visto.
+
+        Args:
+            full (bool): Ignora o delta e relista todas as campanhas
+
+        Returns:
+            dict: {'success', 'updated' (campanhas recebidas), 'total' (no cache)} ou 'error'
+        """
+        with self._lock:
+            account = self._account()
+            updated_since = None if full else account['updated_since']
+
+            # 1 segundo de folga: campanhas alteradas no mesmo segundo da última vista
+            result = self.client.get_campaigns(
+                updated_since=updated_since - 1 if updated_since is not None else None
+            )
+            if not result['success']:
+                return {'success': False, 'error': result['error']}
+
+            if full:
+                account['campaigns'] = {}
+
+            for campaign in result['campaigns']:
+                account['campaigns'][campaign['id']] = campaign
+
+                if campaign.get('updated_time'):
+                    seen = self._parse_time(campaign['updated_time'])
+                    if account['updated_since'] is None or seen > account['updated_since']:
+                        account['updated_since'] = seen
+
+            account['synced_at'] = datetime.now().isoformat()
+            self._save()
+
+            print(f"🗂️  Cache de campanhas: {len(result['campaigns'])} atualizadas, {len(account['campaigns'])} no total")
+
+            return {
+                'success': True,
+                'updated': len(result['campaigns']),
+                'total': len(account['campaigns']),
+            }
+
+    def get(self, campaign_id, account_id=None):
+        """
+        Metadados de uma campanha (sem chamada à API)
+
+        Returns:
+            dict: Registro no formato de MetaAdsClient.get_campaigns ou None
+        """
+        return self._account(account_id)['campaigns'].get(str(campaign_id))
+
+    def enrich(self, rows, account_id=None):
+        """
+        Completa linhas de insights com nome, status e objetivo da campanha
+
+        Valores já presentes na linha são mantidos.
+
+        Args:
+            rows (list): Registros com 'campaign_id' (modificados no lugar)
+
+        Returns:
+            list: Os mesmos registros
+        """
+        campaigns = self._account(account_id)['campaigns']
+
+        for row in rows:
+            campaign = campaigns.get(row.get('campaign_id'))
+            if campaign is None:
+                continue
+            for column, field in self.ENRICH_COLUMNS.items():
+                if row.get(column) is None:
+                    row[column] = campaign.get(field)
+
+        return rows
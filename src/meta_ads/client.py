@@ -3,28 +3,172 @@ Cliente para integração com Meta Ads API (Facebook/Instagram)
 """
 import os
 import sys
+import copy
 import json
+import time
+import pytz
 import requests
 from pathlib import Path
 from datetime import datetime, timedelta
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from facebook_business.api import FacebookAdsApi
 from facebook_business.adobjects.adaccount import AdAccount
 from facebook_business.adobjects.campaign import Campaign
 from facebook_business.adobjects.adsinsights import AdsInsights
+from facebook_business.adobjects.adreportrun import AdReportRun
 
 # Adicionar o diretório raiz ao path
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
 
-from config.settings import META_ADS_CONFIG, LOGS_DIR
+from config.settings import META_ADS_CONFIG, LOGS_DIR, TIMEZONE
+from src.meta_ads.parsing import parse_insights_batch, parse_insights_rows, concat_batches, HOURLY_BREAKDOWN
+from src.meta_ads.batch import GraphBatch
+from src.meta_ads.filters import CampaignFilter
+from src.meta_ads.hierarchy import InsightHierarchy
+from src.meta_ads.cube import CubeTable, InsightCube
+from src.meta_ads.rate_limit import get_app_budget, get_app_governor
+from src.meta_ads.sync import InsightSync
 
 
 class MetaAdsClient:
     """Cliente para coletar dados do Meta Ads (Facebook/Instagram)"""
 
-    def __init__(self):
+    # Linhas esperadas por entidade/dia com o breakdown impression_device
+    DEVICE_ROWS_PER_DAY = 4
+
+    # Intervalos (segundos) entre consultas de status do relatório assíncrono
+    ASYNC_POLL_BACKOFF = [2, 3, 5, 8, 13, 20, 30]
+
+    # Registros por página da API (cada página é normalizada de uma vez)
+    PAGE_SIZE = 500
+
+    # Campanhas por página na expansão campaigns{...insights{...}} (cada uma traz seus insights)
+    CAMPAIGN_EXPANSION_PAGE_SIZE = 25
+
+    # Campos de hierarquia pedidos na coleta no nível de anúncio
+    HIERARCHY_FIELDS = [
+        AdsInsights.Field.adset_id,
+        AdsInsights.Field.adset_name,
+        AdsInsights.Field.ad_id,
+        AdsInsights.Field.ad_name,
+    ]
+
+    # IDs pedidos sempre abaixo do nível campanha (fazem parte da chave de cada linha)
+    LEVEL_ID_FIELDS = {
+        'adset': [AdsInsights.Field.adset_id],
+        'ad': [AdsInsights.Field.adset_id, AdsInsights.Field.ad_id],
+    }
+
+    # Campos de get_account_info
+    ACCOUNT_INFO_FIELDS = [
+        'name',
+        'account_id',
+        'currency',
+        'account_status',
+        'business_name'
+    ]
+
+    # Campos de get_campaigns
+    CAMPAIGN_FIELDS = [
+        Campaign.Field.id,
+        Campaign.Field.name,
+        Campaign.Field.status,
+        Campaign.Field.objective,
+        Campaign.Field.created_time,
+        Campaign.Field.updated_time
+    ]
+
+    # Perfis de campos: cada dashboard pede só as métricas que usa
+    FIELD_PROFILES = {
+        # Indicadores principais (gasto, leads, CPL, CTR, CPC, CPM)
+        'kpi': [
+            AdsInsights.Field.campaign_id,
+            AdsInsights.Field.campaign_name,
+            AdsInsights.Field.date_start,
+            AdsInsights.Field.impressions,
+            AdsInsights.Field.clicks,
+            AdsInsights.Field.spend,
+            AdsInsights.Field.cpc,
+            AdsInsights.Field.cpm,
+            AdsInsights.Field.ctr,
+            AdsInsights.Field.actions,  # Conversões
+        ],
+        # Entrega por dispositivo
+        'device': [
+            AdsInsights.Field.campaign_id,
+            AdsInsights.Field.campaign_name,
+            AdsInsights.Field.date_start,
+            AdsInsights.Field.impressions,
+            AdsInsights.Field.clicks,
+            AdsInsights.Field.spend,
+            AdsInsights.Field.reach,
+            AdsInsights.Field.ctr,
+        ],
+        # Todos os campos
+        'full': [
+            AdsInsights.Field.campaign_id,
+            AdsInsights.Field.campaign_name,
+            AdsInsights.Field.date_start,
+            AdsInsights.Field.date_stop,
+            AdsInsights.Field.impressions,
+            AdsInsights.Field.clicks,
+            AdsInsights.Field.spend,
+            AdsInsights.Field.reach,
+            AdsInsights.Field.frequency,
+            AdsInsights.Field.cpc,
+            AdsInsights.Field.cpm,
+            AdsInsights.Field.cpp,
+            AdsInsights.Field.ctr,
+            AdsInsights.Field.actions,  # Conversões
+            AdsInsights.Field.action_values,
+            AdsInsights.Field.cost_per_action_type,
+        ],
+    }
+
+    def __init__(self, store=None, ad_account_ids=None, budget=None, governor=None,
+                 account_campaign_ids=None):
+        """
+        Args:
+            store (InsightStore): Armazenamento local opcional; quando informado,
+                todo período coletado por get_insights com o perfil 'full' é gravado nele
+            ad_account_ids (list): Contas de anúncios (padrão: META_AD_ACCOUNT_IDS).
+                A primeira é a conta principal, usada pelos métodos de conta única
+            account_campaign_ids (dict): Conta -> IDs das campanhas acompanhadas nela
+                (padrão: META_CAMPAIGN_IDS só na conta principal; contas sem
+                entrada coletam todas as campanhas)
+            budget (CallBudget): Orçamento de chamadas (padrão: o do aplicativo)
+            governor (RequestGovernor): Controle de concorrência pelo uso informado
+                pelo Meta (padrão: o do aplicativo)
+        """
         self.access_token = META_ADS_CONFIG['access_token']
-        self.ad_account_id = META_ADS_CONFIG['ad_account_id']
-        self.campaign_ids = META_ADS_CONFIG['campaign_ids']
+        self.ad_account_ids = [
+            self._normalize_account_id(account_id)
+            for account_id in (ad_account_ids or META_ADS_CONFIG['ad_account_ids'])
+        ]
+        self.ad_account_id = self.ad_account_ids[0] if self.ad_account_ids else None
+
+        # IDs de campanha pertencem a uma única conta: o filtro é montado por conta
+        if account_campaign_ids is None:
+            account_campaign_ids = {self.ad_account_id: META_ADS_CONFIG['campaign_ids']}
+        self.account_campaign_ids = {
+            self._normalize_account_id(account_id): [str(campaign_id) for campaign_id in campaign_ids]
+            for account_id, campaign_ids in account_campaign_ids.items()
+            if account_id
+        }
+        self.campaign_ids = self.account_campaign_ids.get(self.ad_account_id, [])
+        self.campaign_filter = self._campaign_filter_for(self.ad_account_id)
+        self.async_row_threshold = META_ADS_CONFIG['async_row_threshold']
+        self.async_timeout = META_ADS_CONFIG['async_timeout']
+        self.shard_window_days = META_ADS_CONFIG['shard_window_days']
+        self.shard_workers = META_ADS_CONFIG['shard_workers']
+        self.account_workers = META_ADS_CONFIG['account_workers']
+        self.http_pool_size = META_ADS_CONFIG['http_pool_size']
+        self.cube_breakdowns = META_ADS_CONFIG['cube_breakdowns']
+        self._campaign_count = None
+        self.store = store
+        self.budget = budget or get_app_budget()
+        self.governor = governor or get_app_governor()
 
         if not self.access_token:
             raise ValueError("META_ACCESS_TOKEN não configurado. Verifique o arquivo .env")
@@ -34,22 +178,145 @@ class MetaAdsClient:
 
         # Inicializar API
         try:
-            FacebookAdsApi.init(access_token=self.access_token)
-            self.ad_account = AdAccount(self.ad_account_id)
+            self.api = FacebookAdsApi.init(access_token=self.access_token)
+            if META_ADS_CONFIG['graph_url']:
+                self.api._session.GRAPH = META_ADS_CONFIG['graph_url'].rstrip('/')
+            self._configure_http_pool()
+            # O orçamento fica por fora do governador: uma chamada esperando
+            # orçamento não ocupa vaga de concorrência
+            self.governor.install(self.api)
+            self.budget.install(self.api)
+            self.ad_account = AdAccount(self.ad_account_id, api=self.api)
             print(f"✅ Meta Ads API inicializada")
         except Exception as e:
             raise Exception(f"Erro ao inicializar Meta Ads API: {e}")
 
+    def _configure_http_pool(self):
+        """
+        Dimensiona o pool de conexões keep-alive da sessão da API
+
+        O requests.Session do SDK mantém só 10 conexões por host; com janelas
+        e contas em paralelo as threads excedentes abririam (e descartariam)
+        novas conexões TLS a cada chamada.
+        """
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.http_pool_size,
+            pool_maxsize=self.http_pool_size
+        )
+        self.api._session.requests.mount('https://', adapter)
+
+    @classmethod
+    def from_sheet_config(cls, records, **kwargs):
+        """
+        Cria o cliente com as contas Meta ativas da aba de Config
+
+        Args:
+            records (list): Registros da aba Config (GoogleSheetsClient.read_config)
+            **kwargs: Demais argumentos do construtor (store, budget, ...)
+
+        Returns:
+            MetaAdsClient: Cliente com uma conta por linha ativa e as campanhas
+                da coluna 'Campaign IDs' aplicadas só à conta da linha
+
+        Raises:
+            ValueError: Se a aba não tiver nenhuma conta Meta ativa
+        """
+        accounts = accounts_from_sheet_config(records)
+        if not accounts:
+            raise ValueError("Nenhuma conta Meta ativa na aba de Config")
+
+        return cls(ad_account_ids=list(accounts), account_campaign_ids=accounts, **kwargs)
+
+    @staticmethod
+    def _normalize_account_id(account_id):
+        """Garante o prefixo 'act_' no ID da conta"""
+        account_id = str(account_id).strip()
+        return account_id if account_id.startswith('act_') else f"act_{account_id}"
+
+    def _campaign_filter_for(self, account_id):
+        """Filtro de campanhas da conta: IDs dela e status/trechos de nome globais"""
+        return CampaignFilter(
+            campaign_ids=self.account_campaign_ids.get(account_id),
+            statuses=META_ADS_CONFIG['campaign_statuses'],
+            name_patterns=META_ADS_CONFIG['campaign_name_patterns'],
+        )
+
+    def for_account(self, account_id):
+        """
+        Retorna uma cópia do cliente apontando para outra conta
+
+        A cópia compartilha a sessão da API, o store, o orçamento de chamadas e o
+        governador de concorrência.
+        """
+        account_id = self._normalize_account_id(account_id)
+
+        client = copy.copy(self)
+        client.ad_account_id = account_id
+        client.ad_account = AdAccount(account_id, api=self.api)
+        client.campaign_ids = self.account_campaign_ids.get(account_id, [])
+        client.campaign_filter = self._campaign_filter_for(account_id)
+        client._campaign_count = None
+        return client
+
+    def collect_accounts(self, date_from=None, date_to=None, level='campaign', profile='full',
+                         account_ids=None, max_workers=None):
+        """
+        Coleta insights de várias contas em paralelo e junta tudo em um único conjunto
+
+        As contas rodam em um pool de threads (a coleta é limitada por rede, e
+        as threads compartilham a sessão HTTP e o orçamento de chamadas do app).
+
+        Args:
+            date_from (str): Data inicial no formato 'YYYY-MM-DD'
+            date_to (str): Data final no formato 'YYYY-MM-DD'
+            level (str): Nível dos dados ('account', 'campaign', 'adset', 'ad')
+            profile (str): Perfil de campos ('kpi', 'device', 'full')
+            account_ids (list): Contas a coletar (padrão: self.ad_account_ids)
+            max_workers (int): Contas simultâneas (padrão: META_ACCOUNT_WORKERS)
+
+        Returns:
+            dict: Registros de todas as contas (coluna 'account_id') e status por conta
+        """
+        account_ids = [
+            self._normalize_account_id(account_id)
+            for account_id in (account_ids or self.ad_account_ids)
+        ]
+        max_workers = max_workers or self.account_workers
+
+        def collect(account_id):
+            return account_id, self.for_account(account_id).get_insights(
+                date_from, date_to, level=level, profile=profile
+            )
+
+        results = []
+        accounts = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for account_id, result in executor.map(collect, account_ids):
+                if not result['success']:
+                    accounts[account_id] = {'success': False, 'error': result['error']}
+                    continue
+
+                for row in result['data']:
+                    row['account_id'] = account_id
+                results.extend(result['data'])
+                accounts[account_id] = {'success': True, 'total_records': result['total_records']}
+
+        failed = [account_id for account_id, status in accounts.items() if not status['success']]
+        print(f"🏢 {len(account_ids) - len(failed)}/{len(account_ids)} contas coletadas ({len(results)} registros)")
+
+        return {
+            'success': len(failed) < len(account_ids),
+            'data': results,
+            'total_records': len(results),
+            'accounts': accounts,
+            'error': f"Falha nas contas: {', '.join(failed)}" if failed else None,
+        }
+
     def get_account_info(self):
         """Obtém informações da conta de anúncios"""
         try:
-            account = self.ad_account.api_get(fields=[
-                'name',
-                'account_id',
-                'currency',
-                'account_status',
-                'business_name'
-            ])
+            account = self.ad_account.api_get(fields=self.ACCOUNT_INFO_FIELDS)
 
             return {
                 'success': True,
@@ -63,27 +330,73 @@ class MetaAdsClient:
                 'error': str(e)
             }
 
-    def get_campaigns(self):
-        """Lista todas as campanhas da conta"""
+    def get_account_info_bulk(self, account_ids=None):
+        """
+        Obtém informações de várias contas em requisições de lote (até 50 contas cada)
+
+        Args:
+            account_ids (list): Contas a consultar (padrão: self.ad_account_ids)
+
+        Returns:
+            dict: Status por conta em 'accounts' ({'success', 'data'} ou {'success', 'error'})
+        """
+        account_ids = [
+            self._normalize_account_id(account_id)
+            for account_id in (account_ids or self.ad_account_ids)
+        ]
+
+        batch = GraphBatch(self.api, governor=self.governor)
+        for account_id in account_ids:
+            batch.get(account_id, {'fields': self.ACCOUNT_INFO_FIELDS})
+
+        accounts = {}
+        for account_id, result in zip(account_ids, batch.execute()):
+            if result['success']:
+                accounts[account_id] = {'success': True, 'data': result['data']}
+            else:
+                accounts[account_id] = {'success': False, 'error': result['error']}
+
+        failed = [account_id for account_id, status in accounts.items() if not status['success']]
+
+        return {
+            'success': len(failed) < len(account_ids),
+            'accounts': accounts,
+            'error': f"Falha nas contas: {', '.join(failed)}" if failed else None,
+        }
+
+    @staticmethod
+    def _campaign_record(campaign):
+        return {
+            'id': campaign.get('id'),
+            'name': campaign.get('name'),
+            'status': campaign.get('status'),
+            'objective': campaign.get('objective'),
+            'created_time': campaign.get('created_time'),
+            'updated_time': campaign.get('updated_time'),
+        }
+
+    def get_campaigns(self, updated_since=None):
+        """
+        Lista todas as campanhas da conta
+
+        Args:
+            updated_since (float): Só campanhas alteradas depois deste instante
+                (timestamp Unix), via filtering da Graph API
+        """
         try:
-            campaigns = self.ad_account.get_campaigns(fields=[
-                Campaign.Field.id,
-                Campaign.Field.name,
-                Campaign.Field.status,
-                Campaign.Field.objective,
-                Campaign.Field.created_time,
-                Campaign.Field.updated_time
-            ])
+            params = {'limit': self.PAGE_SIZE}
+            if updated_since is not None:
+                params['filtering'] = [{
+                    'field': 'updated_time',
+                    'operator': 'GREATER_THAN',
+                    'value': int(updated_since),
+                }]
+
+            campaigns = self.ad_account.get_campaigns(fields=self.CAMPAIGN_FIELDS, params=params)
 
             campaign_list = []
             for campaign in campaigns:
-                campaign_list.append({
-                    'id': campaign.get('id'),
-                    'name': campaign.get('name'),
-                    'status': campaign.get('status'),
-                    'objective': campaign.get('objective'),
-                    'created_time': campaign.get('created_time'),
-                })
+                campaign_list.append(self._campaign_record(campaign))
 
             return {
                 'success': True,
@@ -97,17 +410,323 @@ class MetaAdsClient:
                 'error': str(e)
             }
 
-    def get_insights(self, date_from=None, date_to=None, level='campaign'):
+    def get_campaigns_bulk(self, account_ids=None):
         """
-        Obtém insights/métricas das campanhas
+        Lista as campanhas de várias contas em requisições de lote
+
+        A primeira página de cada conta sai em um lote; as páginas seguintes
+        de todas as contas que ainda têm resultados vão juntas no lote
+        seguinte, até esgotar.
+
+        Args:
+            account_ids (list): Contas a consultar (padrão: self.ad_account_ids)
+
+        Returns:
+            dict: Campanhas por conta em 'campaigns' e erros por conta em 'errors'
+        """
+        account_ids = [
+            self._normalize_account_id(account_id)
+            for account_id in (account_ids or self.ad_account_ids)
+        ]
+
+        campaigns = {account_id: [] for account_id in account_ids}
+        errors = {}
+        params = {'fields': self.CAMPAIGN_FIELDS, 'limit': self.PAGE_SIZE}
+        pending = {account_id: dict(params) for account_id in account_ids}
+
+        while pending:
+            batch = GraphBatch(self.api, governor=self.governor)
+            for account_id, page_params in pending.items():
+                batch.get(f"{account_id}/campaigns", page_params)
+
+            next_pending = {}
+            for (account_id, page_params), result in zip(pending.items(), batch.execute()):
+                if not result['success']:
+                    errors[account_id] = result['error']
+                    continue
+
+                page = result['data'] or {}
+                campaigns[account_id].extend(
+                    self._campaign_record(campaign) for campaign in page.get('data', [])
+                )
+
+                paging = page.get('paging', {})
+                if paging.get('next') and paging.get('cursors', {}).get('after'):
+                    next_pending[account_id] = dict(page_params, after=paging['cursors']['after'])
+
+            pending = next_pending
+
+        for account_id in errors:
+            campaigns.pop(account_id, None)
+
+        total = sum(len(account_campaigns) for account_campaigns in campaigns.values())
+        print(f"📋 {total} campanhas de {len(campaigns)}/{len(account_ids)} contas")
+
+        return {
+            'success': len(errors) < len(account_ids),
+            'campaigns': campaigns,
+            'total': total,
+            'errors': errors,
+        }
+
+    def _count_campaigns(self):
+        """Conta as campanhas coletadas (chamadas leves, resultado em cache)"""
+        if self._campaign_count is None:
+            if self.campaign_filter.ids_only:
+                self._campaign_count = len(self.campaign_filter.campaign_ids)
+            else:
+                self._campaign_count = 0
+                for filtering in self.campaign_filter.campaign_filtering() or [None]:
+                    params = {'limit': 1}
+                    if filtering:
+                        params['filtering'] = filtering
+
+                    cursor = self.ad_account.get_campaigns(fields=[Campaign.Field.id], params=params)
+                    cursor.load_next_page()
+                    try:
+                        self._campaign_count += cursor.total()
+                    except Exception:
+                        self._campaign_count += len(cursor)
+
+        return self._campaign_count
+
+    def estimate_rows(self, date_from, date_to, level='campaign', breakdowns=('impression_device',)):
+        """
+        Estima quantas linhas uma consulta de insights vai retornar
 
         Args:
             date_from (str): Data inicial no formato 'YYYY-MM-DD'
             date_to (str): Data final no formato 'YYYY-MM-DD'
-            level (str): Nível dos dados ('account', 'campaign', 'adset', 'ad')
+            level (str): Nível dos dados
+            breakdowns (list): Breakdowns da consulta
 
         Returns:
-            dict: Dados de performance
+            int: Estimativa de linhas (dias x entidades x dispositivos)
+        """
+        days = (
+            datetime.strptime(date_to, '%Y-%m-%d') - datetime.strptime(date_from, '%Y-%m-%d')
+        ).days + 1
+
+        entities = 1 if level == 'account' else max(self._count_campaigns(), 1)
+
+        devices = self.DEVICE_ROWS_PER_DAY if 'impression_device' in (breakdowns or ()) else 1
+
+        return days * entities * devices
+
+    def _run_async_report(self, fields, params):
+        """
+        Submete um relatório assíncrono (AdReportRun) e aguarda sua conclusão
+
+        Returns:
+            Cursor: Páginas de resultado do relatório
+        """
+        report_run = self.ad_account.get_insights(
+            fields=fields,
+            params=dict(params),
+            is_async=True
+        )
+        report_id = report_run.get_id()
+        print(f"⏳ Relatório assíncrono {report_id} submetido")
+
+        started = time.monotonic()
+        attempt = 0
+
+        while True:
+            report_run = report_run.api_get(fields=[
+                AdReportRun.Field.async_status,
+                AdReportRun.Field.async_percent_completion,
+            ])
+            status = report_run[AdReportRun.Field.async_status]
+            percent = report_run[AdReportRun.Field.async_percent_completion]
+
+            if status == 'Job Completed' and percent == 100:
+                break
+
+            if status in ('Job Failed', 'Job Skipped'):
+                raise Exception(f"Relatório assíncrono {report_id} terminou com status '{status}'")
+
+            if time.monotonic() - started > self.async_timeout:
+                raise TimeoutError(
+                    f"Relatório assíncrono {report_id} não terminou em {self.async_timeout}s"
+                )
+
+            delay = self.ASYNC_POLL_BACKOFF[min(attempt, len(self.ASYNC_POLL_BACKOFF) - 1)]
+            print(f"⏳ Relatório {report_id}: {status} ({percent}%)")
+            time.sleep(delay)
+            attempt += 1
+
+        return report_run.get_result(params={'limit': self.PAGE_SIZE})
+
+    def _fetch_insights(self, fields, params, async_mode=None):
+        """
+        Executa a consulta de insights no modo síncrono ou assíncrono
+
+        Args:
+            fields (list): Campos solicitados
+            params (dict): Parâmetros da consulta
+            async_mode (bool): True/False força o modo; None decide pela estimativa de linhas
+
+        Returns:
+            Cursor: Iterador sobre os insights (paginação feita pelo SDK)
+        """
+        if async_mode is None:
+            try:
+                estimated = self.estimate_rows(
+                    params['time_range']['since'],
+                    params['time_range']['until'],
+                    params['level'],
+                    params.get('breakdowns')
+                )
+                async_mode = estimated > self.async_row_threshold
+            except Exception:
+                async_mode = False
+
+        if async_mode:
+            return self._run_async_report(fields, params)
+
+        return self.ad_account.get_insights(fields=fields, params=params)
+
+    @staticmethod
+    def _split_date_range(date_from, date_to, window_days):
+        """
+        Divide [date_from, date_to] em janelas consecutivas de até window_days dias
+
+        Returns:
+            list: Lista de tuplas (since, until) em ordem cronológica
+        """
+        start = datetime.strptime(date_from, '%Y-%m-%d')
+        end = datetime.strptime(date_to, '%Y-%m-%d')
+
+        windows = []
+        while start <= end:
+            stop = min(start + timedelta(days=window_days - 1), end)
+            windows.append((start.strftime('%Y-%m-%d'), stop.strftime('%Y-%m-%d')))
+            start = stop + timedelta(days=1)
+
+        return windows
+
+    @classmethod
+    def get_profile_fields(cls, profile):
+        """
+        Retorna os campos da API de um perfil de métricas
+
+        Args:
+            profile (str): 'kpi', 'device' ou 'full'
+
+        Returns:
+            list: Campos (AdsInsights.Field) do perfil
+        """
+        if profile not in cls.FIELD_PROFILES:
+            raise ValueError(
+                f"Perfil de campos desconhecido: '{profile}'. "
+                f"Use um de: {', '.join(cls.FIELD_PROFILES)}"
+            )
+        return list(cls.FIELD_PROFILES[profile])
+
+    @classmethod
+    def get_level_fields(cls, profile, level):
+        """
+        Campos do perfil mais os IDs que identificam uma linha do nível
+
+        Sem adset_id/ad_id, anúncios da mesma campanha, dia e dispositivo
+        seriam indistinguíveis (e se sobrescreveriam no store).
+
+        Returns:
+            list: Campos (AdsInsights.Field) pedidos à API
+        """
+        fields = cls.get_profile_fields(profile)
+        fields += [field for field in cls.LEVEL_ID_FIELDS.get(level, []) if field not in fields]
+        return fields
+
+    def _iter_window_pages(self, fields, params, async_mode=None):
+        """Coleta uma janela de datas, gerando uma página (lista de insights) por vez"""
+        insights = iter(self._fetch_insights(fields, params, async_mode))
+
+        while True:
+            # O cursor só busca a próxima página quando a atual se esgota
+            page = list(islice(insights, self.PAGE_SIZE))
+            if not page:
+                break
+            yield page
+
+    def _iter_sharded_pages(self, fields, params, windows, async_mode, max_workers):
+        """Coleta as janelas em paralelo e gera as páginas em ordem de data"""
+        window_params = [
+            dict(params, time_range={'since': since, 'until': until})
+            for since, until in windows
+        ]
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            # map preserva a ordem das janelas, logo as páginas saem em ordem de data
+            chunks = executor.map(
+                lambda p: list(self._iter_window_pages(fields, p, async_mode)),
+                window_params
+            )
+
+            # As janelas não se sobrepõem: cada linha vem de uma só, nada a deduplicar
+            for chunk in chunks:
+                yield from chunk
+
+        print(f"🧩 {len(windows)} janelas coletadas em paralelo")
+
+    def _iter_filtered_pages(self, fields, params, groups, windows, async_mode, max_workers):
+        """
+        Coleta uma consulta por grupo de filtro (blocos de IDs / trechos de nome)
+
+        Uma campanha que atende a mais de um grupo (ex.: dois trechos de nome)
+        só é mantida no primeiro em que aparece.
+        """
+        seen_campaigns = set()
+
+        for filtering in groups:
+            group_params = dict(params, filtering=filtering)
+            if len(windows) > 1:
+                source = self._iter_sharded_pages(fields, group_params, windows, async_mode, max_workers)
+            else:
+                source = self._iter_window_pages(fields, group_params, async_mode)
+
+            group_campaigns = set()
+            for page in source:
+                campaign_ids = [insight.get('campaign_id') for insight in page]
+                group_campaigns.update(campaign_ids)
+                yield [
+                    insight for insight, campaign_id in zip(page, campaign_ids)
+                    if campaign_id not in seen_campaigns
+                ]
+
+            seen_campaigns |= group_campaigns
+
+        print(f"🎯 {len(groups)} consultas filtradas por campanha")
+
+    def iter_insights(self, date_from=None, date_to=None, level='campaign', async_mode=None,
+                      window_days=None, max_workers=None, batches=False,
+                      breakdowns=('impression_device',), profile='full', extra_fields=()):
+        """
+        Gera os insights página a página, conforme o cursor da Graph API avança
+
+        A memória fica limitada a uma página (ou às janelas em andamento, no modo
+        em paralelo), em vez de crescer com período x campanhas x dispositivos.
+
+        Args:
+            date_from (str): Data inicial no formato 'YYYY-MM-DD'
+            date_to (str): Data final no formato 'YYYY-MM-DD'
+            level (str): Nível dos dados ('account', 'campaign', 'adset', 'ad')
+            async_mode (bool): Usa relatório assíncrono (AdReportRun). Se None, é
+                ativado automaticamente acima de META_ASYNC_ROW_THRESHOLD linhas estimadas
+            window_days (int): Divide o período em janelas de N dias coletadas em
+                paralelo (padrão: META_SHARD_WINDOW_DAYS; 0 desativa)
+            max_workers (int): Máximo de janelas simultâneas (padrão: META_SHARD_WORKERS)
+            batches (bool): Gera lotes colunares (dict de colunas) em vez de registros
+            breakdowns (list): Breakdowns pedidos à API (vazio = uma linha por entidade/dia)
+            profile (str): Perfil de campos ('kpi', 'device', 'full'); os registros
+                só trazem as colunas do perfil
+            extra_fields (list): Campos pedidos além do perfil (ex.: adset_id, ad_name)
+
+        Yields:
+            dict: Registro normalizado, ou lote colunar se batches=True
+
+        Raises:
+            Exception: Erros da API são propagados para quem consome o gerador
         """
         # Definir período padrão (últimos 30 dias)
         if not date_from:
@@ -115,93 +734,96 @@ class MetaAdsClient:
         if not date_to:
             date_to = datetime.now().strftime('%Y-%m-%d')
 
+        if window_days is None:
+            window_days = self.shard_window_days
+        if max_workers is None:
+            max_workers = self.shard_workers
+
         params = {
             'time_range': {
                 'since': date_from,
                 'until': date_to
             },
             'level': level,
-            'breakdowns': ['impression_device'],
             'time_increment': 1,  # Dados diários
+            'limit': self.PAGE_SIZE,
         }
 
-        # Campos (métricas) que queremos
-        fields = [
-            AdsInsights.Field.campaign_id,
-            AdsInsights.Field.campaign_name,
-            AdsInsights.Field.date_start,
-            AdsInsights.Field.date_stop,
-            AdsInsights.Field.impressions,
-            AdsInsights.Field.clicks,
-            AdsInsights.Field.spend,
-            AdsInsights.Field.reach,
-            AdsInsights.Field.frequency,
-            AdsInsights.Field.cpc,
-            AdsInsights.Field.cpm,
-            AdsInsights.Field.cpp,
-            AdsInsights.Field.ctr,
-            AdsInsights.Field.actions,  # Conversões
-            AdsInsights.Field.action_values,
-            AdsInsights.Field.cost_per_action_type,
-        ]
+        if breakdowns:
+            params['breakdowns'] = list(breakdowns)
 
-        try:
-            insights = self.ad_account.get_insights(
-                fields=fields,
-                params=params
-            )
+        # Campos (métricas) que queremos, conforme o perfil e o nível
+        fields = self.get_level_fields(profile, level)
+        fields += [field for field in extra_fields if field not in fields]
 
-            results = []
+        windows = []
+        if window_days and window_days > 0:
+            windows = self._split_date_range(date_from, date_to, window_days)
+
+        # Filtro de campanhas aplicado na API (IDs, status, trechos de nome)
+        groups = self.campaign_filter.insight_filtering()
+        if level == 'account' and len(groups) > 1:
+            # Totais da conta não podem ser somados entre consultas sobrepostas
+            print("⚠️  Filtro de campanhas exige várias consultas; nível 'account' coletado sem filtro")
+            groups = []
 
-            for insight in insights:
-                # Processar ações (conversões, leads, etc)
-                actions = insight.get('actions', [])
-                conversions = 0
-                leads = 0
-
-                for action in actions:
-                    action_type = action.get('action_type', '')
-                    value = int(action.get('value', 0))
-
-                    if 'lead' in action_type.lower():
-                        leads += value
-                    elif 'conversion' in action_type.lower() or 'purchase' in action_type.lower():
-                        conversions += value
-
-                # Dados estruturados
-                data = {
-                    'date': insight.get('date_start'),
-                    'campaign_id': insight.get('campaign_id'),
-                    'campaign_name': insight.get('campaign_name'),
-                    'impressions': int(insight.get('impressions', 0)),
-                    'clicks': int(insight.get('clicks', 0)),
-                    'spend': float(insight.get('spend', 0)),
-                    'reach': int(insight.get('reach', 0)),
-                    'frequency': float(insight.get('frequency', 0)),
-                    'cpc': float(insight.get('cpc', 0)),
-                    'cpm': float(insight.get('cpm', 0)),
-                    'ctr': float(insight.get('ctr', 0)),
-                    'conversions': conversions,
-                    'leads': leads,
-                    'platform': 'Meta Ads'
-                }
-
-                # Calcular CPL (custo por lead)
-                if leads > 0:
-                    data['cpl'] = round(data['spend'] / leads, 2)
-                else:
-                    data['cpl'] = 0
-
-                # Calcular taxa de conversão
-                if data['clicks'] > 0:
-                    data['conversion_rate'] = round((conversions / data['clicks']) * 100, 2)
-                else:
-                    data['conversion_rate'] = 0
-
-                results.append(data)
+        if len(groups) == 1:
+            params['filtering'] = groups[0]
+
+        if len(groups) > 1:
+            source = self._iter_filtered_pages(fields, params, groups, windows, async_mode, max_workers)
+        elif len(windows) > 1:
+            source = self._iter_sharded_pages(fields, params, windows, async_mode, max_workers)
+        else:
+            source = self._iter_window_pages(fields, params, async_mode)
+
+        # Lotes colunares só para quem agrega colunas (cubo, hierarquia); registros
+        # são montados direto da página, sem ida e volta pelo formato colunar
+        for page in source:
+            if batches:
+                yield parse_insights_batch(page, fields, params.get('breakdowns'))
+            else:
+                yield from parse_insights_rows(page, fields, params.get('breakdowns'))
+
+    def get_insights(self, date_from=None, date_to=None, level='campaign', async_mode=None,
+                     window_days=None, max_workers=None, profile='full'):
+        """
+        Obtém insights/métricas das campanhas
+
+        Args:
+            date_from (str): Data inicial no formato 'YYYY-MM-DD'
+            date_to (str): Data final no formato 'YYYY-MM-DD'
+            level (str): Nível dos dados ('account', 'campaign', 'adset', 'ad')
+            async_mode (bool): Ver iter_insights
+            window_days (int): Ver iter_insights
+            max_workers (int): Ver iter_insights
+            profile (str): Perfil de campos ('kpi', 'device', 'full')
+
+        Returns:
+            dict: Dados de performance
+        """
+        # Definir período padrão (últimos 30 dias)
+        if not date_from:
+            date_from = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        if not date_to:
+            date_to = datetime.now().strftime('%Y-%m-%d')
+
+        try:
+            results = list(self.iter_insights(
+                date_from, date_to, level,
+                async_mode=async_mode,
+                window_days=window_days,
+                max_workers=max_workers,
+                profile=profile
+            ))
 
             print(f"✅ {len(results)} registros coletados de {date_from} a {date_to}")
 
+            # Só linhas completas vão para o store: um perfil mais estreito
+            # sobrescreveria campos (reach, frequency...) gravados antes
+            if self.store is not None and profile == 'full':
+                self.store.replace_range(self.ad_account_id, level, date_from, date_to, results)
+
             return {
                 'success': True,
                 'data': results,
@@ -216,67 +838,352 @@ class MetaAdsClient:
                 'error': str(e)
             }
 
-    def get_daily_summary(self, date_from=None, date_to=None):
+    def _follow_pages(self, page):
+        """Gera os registros de uma página da Graph API e das páginas seguintes (paging.next)"""
+        while page:
+            yield from page.get('data', [])
+
+            next_url = page.get('paging', {}).get('next')
+            page = self.api.call('GET', next_url).json() if next_url else None
+
+    def _iter_filtered_campaigns(self, params):
+        """Gera as campanhas da conta, uma consulta por grupo do filtro de campanhas"""
+        for filtering in self.campaign_filter.campaign_filtering() or [None]:
+            group_params = dict(params, filtering=filtering) if filtering else params
+            first_page = self.api.call('GET', (self.ad_account_id, 'campaigns'), params=group_params).json()
+            yield from self._follow_pages(first_page)
+
+    def get_campaigns_with_insights(self, date_from=None, date_to=None, profile='kpi',
+                                    time_increment=1, breakdowns=('impression_device',)):
         """
-        Obtém resumo diário agregado de todas as campanhas
+        Obtém campanhas e seus insights em uma única varredura (expansão de campos)
+
+        Pede campaigns{id,name,status,objective,insights.time_range(...){...}}:
+        cada página de campanhas já traz as métricas do período, sem a segunda
+        varredura de get_insights. Só a paginação interna de uma campanha com
+        mais de PAGE_SIZE linhas gera chamadas extras.
+
+        Args:
+            date_from (str): Data inicial no formato 'YYYY-MM-DD'
+            date_to (str): Data final no formato 'YYYY-MM-DD'
+            profile (str): Perfil de campos ('kpi', 'device', 'full')
+            time_increment (int|str): 1 = linhas diárias (como get_insights);
+                'all_days' = uma linha por campanha com o total do período
+            breakdowns (list): Breakdowns dos insights (vazio = sem breakdown)
 
         Returns:
-            dict: Resumo com totais por dia
+            dict: Registros no formato de get_insights (mais campaign_status e
+                objective) e a lista de campanhas em 'campaigns'
+        """
+        if not date_from:
+            date_from = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        if not date_to:
+            date_to = datetime.now().strftime('%Y-%m-%d')
+
+        fields = self.get_profile_fields(profile)
+
+        modifiers = [
+            f"time_range({json.dumps({'since': date_from, 'until': date_to}, separators=(',', ':'))})",
+            f"time_increment({time_increment})",
+            f"limit({self.PAGE_SIZE})",
+        ]
+        if breakdowns:
+            modifiers.append(f"breakdowns({json.dumps(list(breakdowns), separators=(',', ':'))})")
+
+        insights_field = f"insights.{'.'.join(modifiers)}{{{','.join(fields)}}}"
+        params = {
+            'fields': ','.join(['id', 'name', 'status', 'objective', insights_field]),
+            'limit': self.CAMPAIGN_EXPANSION_PAGE_SIZE,
+        }
+
+        try:
+            results = []
+            campaigns = []
+            seen_campaigns = set()
+
+            for campaign in self._iter_filtered_campaigns(params):
+                if campaign['id'] in seen_campaigns:
+                    continue
+                seen_campaigns.add(campaign['id'])
+                campaigns.append(self._campaign_record(campaign))
+
+                insights = list(self._follow_pages(campaign.get('insights')))
+                if not insights:
+                    continue
+
+                rows = parse_insights_rows(insights, fields, breakdowns)
+                for row in rows:
+                    row['campaign_status'] = campaign.get('status')
+                    row['objective'] = campaign.get('objective')
+                results.extend(rows)
+
+            print(f"✅ {len(campaigns)} campanhas e {len(results)} registros coletados de {date_from} a {date_to}")
+
+            return {
+                'success': True,
+                'data': results,
+                'campaigns': campaigns,
+                'total_records': len(results),
+                'date_range': {'from': date_from, 'to': date_to}
+            }
+
+        except Exception as e:
+            print(f"❌ Erro ao coletar campanhas com insights: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    def collect_hierarchy(self, date_from=None, date_to=None, profile='full',
+                          breakdowns=('impression_device',)):
+        """
+        Coleta insights no nível de anúncio e calcula os níveis acima localmente
+
+        Uma única varredura (anúncio x dia x dispositivo) substitui uma consulta
+        por nível. Os níveis agregados não são gravados no store: nele ficam só
+        linhas no grão da API, com alcance deduplicado pelo Meta.
+
+        Args:
+            date_from (str): Data inicial no formato 'YYYY-MM-DD'
+            date_to (str): Data final no formato 'YYYY-MM-DD'
+            profile (str): Perfil de campos ('kpi', 'device', 'full')
+            breakdowns (list): Breakdowns pedidos à API
+
+        Returns:
+            dict: 'hierarchy' (InsightHierarchy com rollup(level) e dimensions)
         """
-        insights_result = self.get_insights(date_from, date_to, level='account')
+        if not date_from:
+            date_from = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        if not date_to:
+            date_to = datetime.now().strftime('%Y-%m-%d')
+
+        try:
+            hierarchy = InsightHierarchy.from_batches(self.iter_insights(
+                date_from, date_to,
+                level='ad',
+                batches=True,
+                breakdowns=breakdowns,
+                profile=profile,
+                extra_fields=self.HIERARCHY_FIELDS
+            ))
+
+            dimensions = hierarchy.dimensions
+            print(
+                f"🌳 {hierarchy.size} registros de anúncio coletados de {date_from} a {date_to} "
+                f"({len(dimensions['campaign'])} campanhas, {len(dimensions['adset'])} conjuntos, "
+                f"{len(dimensions['ad'])} anúncios)"
+            )
 
-        if not insights_result['success']:
-            return insights_result
+            return {
+                'success': True,
+                'hierarchy': hierarchy,
+                'total_records': hierarchy.size,
+                'date_range': {'from': date_from, 'to': date_to}
+            }
 
-        # Agrupar por data
-        daily_data = {}
+        except Exception as e:
+            print(f"❌ Erro ao coletar insights por anúncio: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
 
-        for record in insights_result['data']:
-            date = record['date']
+    def collect_cube(self, date_from=None, date_to=None, breakdown_sets=None, level='campaign',
+                     profile='full', save=True):
+        """
+        Coleta um cubo de insights com vários conjuntos de breakdowns
 
-            if date not in daily_data:
-                daily_data[date] = {
-                    'date': date,
-                    'impressions': 0,
-                    'clicks': 0,
-                    'spend': 0,
-                    'reach': 0,
-                    'conversions': 0,
-                    'leads': 0,
-                    'platform': 'Meta Ads'
-                }
+        Cada conjunto (ex.: ['age', 'gender']) é uma consulta; o resultado fica
+        em memória (InsightCube.slice) e, com save=True, gravado comprimido em
+        DATA_DIR/meta_ads/cube_<conta>.npz.
 
-            daily_data[date]['impressions'] += record['impressions']
-            daily_data[date]['clicks'] += record['clicks']
-            daily_data[date]['spend'] += record['spend']
-            daily_data[date]['reach'] += record['reach']
-            daily_data[date]['conversions'] += record['conversions']
-            daily_data[date]['leads'] += record['leads']
+        Args:
+            date_from (str): Data inicial no formato 'YYYY-MM-DD'
+            date_to (str): Data final no formato 'YYYY-MM-DD'
+            breakdown_sets (list): Conjuntos de breakdowns (padrão: META_CUBE_BREAKDOWNS)
+            level (str): 'account' ou 'campaign' (campaign_id vira dimensão do cubo)
+            profile (str): Perfil de campos ('kpi', 'device', 'full')
+            save (bool): Grava o cubo em disco
+
+        Returns:
+            dict: 'cube' (InsightCube) e linhas coletadas por conjunto em 'tables'
+        """
+        if not date_from:
+            date_from = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        if not date_to:
+            date_to = datetime.now().strftime('%Y-%m-%d')
+
+        breakdown_sets = breakdown_sets or self.cube_breakdowns
+
+        try:
+            tables = {}
+            for breakdowns in breakdown_sets:
+                columns = concat_batches(self.iter_insights(
+                    date_from, date_to,
+                    level=level,
+                    batches=True,
+                    breakdowns=breakdowns,
+                    profile=profile
+                ))
+                if not columns:
+                    continue
+
+                dimensions = list(breakdowns)
+                if level != 'account':
+                    dimensions = ['campaign_id'] + dimensions
+                tables[','.join(breakdowns)] = CubeTable.from_columns(columns, dimensions)
+
+            cube = InsightCube(tables, {'from': date_from, 'to': date_to})
+            if save:
+                cube.save(InsightCube.default_path(self.ad_account_id))
+
+            print(f"🧊 Cubo com {len(tables)} conjuntos de breakdowns de {date_from} a {date_to}")
+
+            return {
+                'success': True,
+                'cube': cube,
+                'tables': {name: table.size for name, table in tables.items()},
+                'date_range': {'from': date_from, 'to': date_to}
+            }
+
+        except Exception as e:
+            print(f"❌ Erro ao coletar cubo de insights: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    def get_intraday(self, date=None, level='account', profile='kpi'):
+        """
+        Obtém as linhas horárias de um dia (padrão: hoje), para acompanhar o ritmo de gasto
+
+        Usa o breakdown hourly_stats_aggregated_by_advertiser_time_zone e pede
+        só o dia informado, então pode ser repetido a cada poucos minutos sem
+        recoletar o histórico. Com store, as linhas substituem as horárias do dia.
+
+        Args:
+            date (str): Dia no formato 'YYYY-MM-DD' (padrão: hoje no fuso TIMEZONE)
+            level (str): Nível dos dados ('account', 'campaign', ...)
+            profile (str): Perfil de campos ('kpi', 'device', 'full')
+
+        Returns:
+            dict: Registros com a coluna 'hour' ('HH:MM')
+        """
+        # "Hoje" no fuso da conta (TIMEZONE), não no do servidor: o breakdown
+        # horário usa o fuso do anunciante
+        now = datetime.now(pytz.timezone(TIMEZONE))
+        date = date or now.strftime('%Y-%m-%d')
+
+        try:
+            results = list(self.iter_insights(
+                date, date,
+                level=level,
+                breakdowns=(HOURLY_BREAKDOWN,),
+                profile=profile,
+                async_mode=False,
+                window_days=0
+            ))
+
+            if self.store is not None:
+                self.store.replace_hours(self.ad_account_id, level, date, results)
+
+            return {
+                'success': True,
+                'data': results,
+                'total_records': len(results),
+                'date': date,
+                'refreshed_at': now.strftime('%H:%M:%S')
+            }
+
+        except Exception as e:
+            print(f"❌ Erro ao coletar dados horários: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    def get_daily_summary(self, date_from=None, date_to=None, profile='full'):
+        """
+        Obtém resumo diário agregado de todas as campanhas
+
+        Pede à API exatamente a granularidade necessária (conta x dia, sem
+        breakdown): uma linha por dia, com alcance (reach) deduplicado pelo
+        próprio Meta. Localmente só são calculadas as métricas derivadas.
+        Com um InsightStore, os dias passam pela sincronização incremental
+        (InsightSync) e só o que falta ou mudou é pedido à API.
+
+        Args:
+            date_from (str): Data inicial no formato 'YYYY-MM-DD'
+            date_to (str): Data final no formato 'YYYY-MM-DD'
+            profile (str): Perfil de campos ('kpi', 'device', 'full')
+
+        Returns:
+            dict: Resumo com totais por dia
+        """
+        summary_columns = ['impressions', 'clicks', 'spend', 'reach', 'frequency', 'conversions', 'leads']
+        daily_data = []
+
+        try:
+            if self.store is not None:
+                # Com store: sincronização incremental das linhas conta x dia
+                if not date_from:
+                    date_from = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+                if not date_to:
+                    date_to = datetime.now().strftime('%Y-%m-%d')
+                result = InsightSync(self).sync(date_from, date_to, level='account',
+                                                profile=profile, breakdowns=())
+                if not result['success']:
+                    return result
+                records = result['data']
+            else:
+                records = self.iter_insights(date_from, date_to, level='account',
+                                             breakdowns=[], profile=profile)
+
+            for record in records:
+                data = {'date': record['date']}
+                data.update(
+                    (name, record[name]) for name in summary_columns
+                    if record.get(name) is not None
+                )
+                data['platform'] = 'Meta Ads'
+                daily_data.append(data)
+
+        except Exception as e:
+            print(f"❌ Erro ao coletar insights: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
 
         # Calcular métricas derivadas
-        for date, data in daily_data.items():
-            if data['clicks'] > 0:
-                data['cpc'] = round(data['spend'] / data['clicks'], 2)
-                data['conversion_rate'] = round((data['conversions'] / data['clicks']) * 100, 2)
+        for data in daily_data:
+            spend = data.get('spend', 0)
+            clicks = data.get('clicks', 0)
+            impressions = data.get('impressions', 0)
+            leads = data.get('leads', 0)
+
+            if clicks > 0:
+                data['cpc'] = round(spend / clicks, 2)
+                data['conversion_rate'] = round((data.get('conversions', 0) / clicks) * 100, 2)
             else:
                 data['cpc'] = 0
                 data['conversion_rate'] = 0
 
-            if data['impressions'] > 0:
-                data['ctr'] = round((data['clicks'] / data['impressions']) * 100, 2)
-                data['cpm'] = round((data['spend'] / data['impressions']) * 1000, 2)
+            if impressions > 0:
+                data['ctr'] = round((clicks / impressions) * 100, 2)
+                data['cpm'] = round((spend / impressions) * 1000, 2)
             else:
                 data['ctr'] = 0
                 data['cpm'] = 0
 
-            if data['leads'] > 0:
-                data['cpl'] = round(data['spend'] / data['leads'], 2)
+            if leads > 0:
+                data['cpl'] = round(spend / leads, 2)
             else:
                 data['cpl'] = 0
 
         return {
             'success': True,
-            'data': list(daily_data.values()),
+            'data': daily_data,
             'total_days': len(daily_data)
         }
 
@@ -290,6 +1197,38 @@ class MetaAdsClient:
             f.write(json.dumps(error_data, ensure_ascii=False) + '\n')
 
 
+def accounts_from_sheet_config(records):
+    """
+    Extrai as contas Meta ativas da aba de Config (GoogleSheetsClient.read_config)
+
+    Args:
+        records (list): Registros da aba Config
+
+    Returns:
+        dict: Conta (Plataforma 'Meta' e Status 'Ativo') -> IDs da coluna
+            'Campaign IDs' (separados por vírgula; vazio = todas as campanhas)
+    """
+    accounts = {}
+
+    for record in records:
+        account_id = str(record.get('Account ID', '')).strip()
+        if (
+            not account_id
+            or str(record.get('Plataforma', '')).strip().lower() != 'meta'
+            or str(record.get('Status', '')).strip().lower() != 'ativo'
+        ):
+            continue
+
+        campaign_ids = [
+            campaign_id.strip()
+            for campaign_id in str(record.get('Campaign IDs', '')).split(',')
+            if campaign_id.strip()
+        ]
+        accounts.setdefault(account_id, []).extend(campaign_ids)
+
+    return accounts
+
+
 def main():
     """Teste do cliente Meta Ads"""
     print("📘 Testando Cliente Meta Ads\n")
@@ -0,0 +1,244 @@
+"""
+Cubo de insights do Meta Ads por breakdowns
+
+Cada conjunto de breakdowns aceito pela API (dispositivo, posicionamento,
+idade/gênero, região) é coletado uma vez e guardado como uma tabela de
+fatos compacta: as dimensões viram códigos inteiros (dicionário de valores)
+e as métricas, colunas NumPy. Totais por (data, dimensão) são
+pré-calculados, então cortes como "gasto por posicionamento nos últimos 30
+dias" são respondidos da memória, sem nova chamada ao Meta. O cubo é salvo
+comprimido em DATA_DIR/meta_ads.
+"""
+import sys
+import json
+from pathlib import Path
+
+import numpy as np
+
+# Adicionar o diretório raiz ao path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from config.settings import DATA_DIR
+
+
+class CubeTable:
+    """Tabela de fatos de um conjunto de breakdowns, com dimensões codificadas"""
+
+    # Métricas aditivas guardadas no cubo. reach (pessoas únicas) fica de fora:
+    # somá-lo entre dias ou valores de breakdown conta a mesma pessoa várias vezes
+    MEASURES = ['impressions', 'clicks', 'spend', 'conversions', 'leads']
+
+    def __init__(self, dimensions, codes, categories, measures):
+        """
+        Args:
+            dimensions (list): Dimensões da tabela ('date' primeiro)
+            codes (dict): Dimensão -> np.ndarray de códigos
+            categories (dict): Dimensão -> lista de valores (índice = código)
+            measures (dict): Métrica -> np.ndarray
+        """
+        self.dimensions = dimensions
+        self.codes = codes
+        self.categories = categories
+        self.measures = measures
+        self.size = len(codes['date'])
+        self.marginals = self._compute_marginals()
+
+    @classmethod
+    def from_columns(cls, columns, dimensions):
+        """
+        Monta a tabela a partir de um lote colunar (parse_insights_batch)
+
+        Args:
+            columns (dict): Colunas das linhas coletadas
+            dimensions (list): Colunas de dimensão ('date' incluída automaticamente)
+        """
+        dimensions = ['date'] + [name for name in dimensions if name != 'date']
+        codes = {}
+        categories = {}
+
+        for name in dimensions:
+            values = np.array(['' if value is None else str(value) for value in columns[name]], dtype=str)
+            # Categorias ordenadas: as datas ficam em ordem cronológica
+            unique, inverse = np.unique(values, return_inverse=True)
+            categories[name] = unique.tolist()
+            codes[name] = inverse.astype(np.int32 if len(unique) > 32767 else np.int16)
+
+        measures = {
+            name: np.asarray(columns[name])
+            for name in cls.MEASURES if name in columns
+        }
+
+        return cls(dimensions, codes, categories, measures)
+
+    def _compute_marginals(self):
+        """Totais por (data, dimensão) de cada métrica: matrizes [datas x valores]"""
+        marginals = {}
+        dates = self.codes['date'].astype(np.int64)
+        date_count = len(self.categories['date'])
+
+        for name in self.dimensions[1:]:
+            width = len(self.categories[name])
+            combined = dates * width + self.codes[name]
+            marginals[name] = {
+                measure: np.bincount(combined, weights=values, minlength=date_count * width)
+                .reshape(date_count, width)
+                for measure, values in self.measures.items()
+            }
+
+        return marginals
+
+    def _date_mask(self, date_from, date_to):
+        dates = np.array(self.categories['date'])
+        selected = np.ones(len(dates), dtype=bool)
+        if date_from:
+            selected &= dates >= date_from
+        if date_to:
+            selected &= dates <= date_to
+        return selected
+
+    def slice(self, measure, by, date_from=None, date_to=None, where=None):
+        """
+        Total de uma métrica por valor de uma dimensão
+
+        Args:
+            measure (str): Métrica (ex.: 'spend')
+            by (str): Dimensão do corte (ex.: 'publisher_platform', 'date')
+            date_from (str): Data inicial 'YYYY-MM-DD' (inclusiva)
+            date_to (str): Data final 'YYYY-MM-DD' (inclusiva)
+            where (dict): Filtros dimensão -> valor ou lista de valores
+
+        Returns:
+            dict: Valor da dimensão -> total (só valores com total diferente de zero)
+        """
+        if measure not in self.measures:
+            if measure in ('reach', 'frequency'):
+                raise ValueError(
+                    f"'{measure}' não é aditiva e não pode ser cortada no cubo; "
+                    "use get_insights no grão desejado"
+                )
+            raise ValueError(f"Métrica não disponível no cubo: '{measure}'")
+
+        selected_dates = self._date_mask(date_from, date_to)
+
+        if not where and by in self.marginals:
+            # Resposta direta dos totais pré-calculados
+            totals = self.marginals[by][measure][selected_dates].sum(axis=0)
+        else:
+            mask = selected_dates[self.codes['date']]
+            for name, accepted in (where or {}).items():
+                accepted = [accepted] if isinstance(accepted, str) else accepted
+                accepted_codes = [
+                    code for code, value in enumerate(self.categories[name]) if value in accepted
+                ]
+                mask &= np.isin(self.codes[name], accepted_codes)
+
+            totals = np.bincount(
+                self.codes[by][mask],
+                weights=self.measures[measure][mask],
+                minlength=len(self.categories[by])
+            )
+
+        return {
+            value or None: total.item()
+            for value, total in zip(self.categories[by], totals)
+            if total
+        }
+
+    def to_arrays(self, prefix):
+        """Arrays para np.savez_compressed (chaves com o prefixo da tabela)"""
+        arrays = {}
+        for name in self.dimensions:
+            arrays[f"{prefix}codes|{name}"] = self.codes[name]
+            arrays[f"{prefix}categories|{name}"] = np.array(self.categories[name], dtype=str)
+        for name, values in self.measures.items():
+            arrays[f"{prefix}measures|{name}"] = values
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix, dimensions):
+        codes = {name: arrays[f"{prefix}codes|{name}"] for name in dimensions}
+        categories = {name: arrays[f"{prefix}categories|{name}"].tolist() for name in dimensions}
+        measures = {
+            name: arrays[f"{prefix}measures|{name}"]
+            for name in cls.MEASURES if f"{prefix}measures|{name}" in arrays
+        }
+        return cls(dimensions, codes, categories, measures)
+
+
+class InsightCube:
+    """Conjunto de tabelas do cubo, uma por conjunto de breakdowns"""
+
+    def __init__(self, tables=None, date_range=None):
+        """
+        Args:
+            tables (dict): Nome do conjunto (ex.: 'age,gender') -> CubeTable
+            date_range (dict): {'from', 'to'} coberto pelo cubo
+        """
+        self.tables = tables or {}
+        self.date_range = date_range
+
+    def table_for(self, *dimensions):
+        """Tabela que contém todas as dimensões (a menor delas, se houver várias)"""
+        candidates = [
+            table for table in self.tables.values()
+            if all(name in table.dimensions for name in dimensions)
+        ]
+        if not candidates:
+            raise ValueError(
+                f"Nenhum breakdown do cubo contém: {', '.join(dimensions)}. "
+                f"Disponíveis: {'; '.join(self.tables)}"
+            )
+        return min(candidates, key=lambda table: table.size)
+
+    def slice(self, measure, by, date_from=None, date_to=None, where=None):
+        """
+        Corte do cubo (ver CubeTable.slice); a tabela é escolhida pelas dimensões usadas
+
+        Exemplo:
+            cube.slice('spend', 'publisher_platform', '2026-01-01', '2026-01-30')
+        """
+        table = self.table_for(by, *(where or {}))
+        return table.slice(measure, by, date_from, date_to, where)
+
+    def save(self, path):
+        """Grava o cubo comprimido (.npz)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        arrays = {}
+        manifest = {'date_range': self.date_range, 'tables': {}}
+        for index, (name, table) in enumerate(self.tables.items()):
+            prefix = f"t{index}|"
+            arrays.update(table.to_arrays(prefix))
+            manifest['tables'][name] = {'prefix': prefix, 'dimensions': table.dimensions}
+
+        arrays['manifest'] = np.array(json.dumps(manifest))
+
+        tmp = path.with_name(path.stem + '.tmp.npz')
+        np.savez_compressed(tmp, **arrays)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Lê um cubo gravado por save()
+
+        Returns:
+            InsightCube: Cubo, ou None se o arquivo não existir
+        """
+        path = Path(path)
+        if not path.exists():
+            return None
+
+        with np.load(path) as arrays:
+            manifest = json.loads(arrays['manifest'].item())
+            tables = {
+                name: CubeTable.from_arrays(arrays, spec['prefix'], spec['dimensions'])
+                for name, spec in manifest['tables'].items()
+            }
+
+        return cls(tables, manifest['date_range'])
+
+    @staticmethod
+    def default_path(account_id):
+        return DATA_DIR / 'meta_ads' / f"cube_{account_id}.npz"
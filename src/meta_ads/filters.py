@@ -0,0 +1,93 @@
+"""
+Filtros de campanhas aplicados na própria Graph API
+
+Converte os IDs de campanha configurados, filtros de status e trechos de
+nome no parâmetro `filtering` da API, para que só as campanhas acompanhadas
+sejam coletadas. Listas longas de IDs são divididas em várias consultas.
+"""
+import json
+
+
+class CampaignFilter:
+    """Seleção de campanhas (IDs, status, trechos de nome) convertida em `filtering`"""
+
+    # Máximo de IDs em um único filtro IN (listas maiores viram várias consultas)
+    MAX_IDS_PER_FILTER = 100
+
+    def __init__(self, campaign_ids=None, statuses=None, name_patterns=None):
+        """
+        Args:
+            campaign_ids (list): IDs das campanhas acompanhadas
+            statuses (list): Status efetivos aceitos (ex.: ['ACTIVE', 'PAUSED'])
+            name_patterns (list): Trechos de nome; a campanha precisa conter ao menos um
+        """
+        self.campaign_ids = [str(campaign_id) for campaign_id in (campaign_ids or [])]
+        self.statuses = [status.upper() for status in (statuses or [])]
+        self.name_patterns = list(name_patterns or [])
+
+    def __bool__(self):
+        return bool(self.campaign_ids or self.statuses or self.name_patterns)
+
+    @property
+    def ids_only(self):
+        """True quando o filtro é só uma lista de IDs (o conjunto de campanhas é conhecido)"""
+        return bool(self.campaign_ids) and not (self.statuses or self.name_patterns)
+
+    def signature(self):
+        """
+        Identificação estável do filtro (muda quando a seleção muda)
+
+        Returns:
+            str: JSON da seleção, ou None sem filtro
+        """
+        if not self:
+            return None
+        return json.dumps({
+            'ids': sorted(self.campaign_ids),
+            'statuses': sorted(self.statuses),
+            'names': sorted(self.name_patterns),
+        }, separators=(',', ':'))
+
+    def _groups(self, prefix):
+        if not self:
+            return []
+
+        # A API combina as condições de um filtering com E: blocos de IDs e
+        # trechos de nome alternativos (OU) viram consultas separadas
+        id_chunks = [
+            self.campaign_ids[start:start + self.MAX_IDS_PER_FILTER]
+            for start in range(0, len(self.campaign_ids), self.MAX_IDS_PER_FILTER)
+        ] or [None]
+        patterns = self.name_patterns or [None]
+
+        groups = []
+        for chunk in id_chunks:
+            for pattern in patterns:
+                filtering = []
+                if chunk:
+                    filtering.append({'field': f"{prefix}id", 'operator': 'IN', 'value': chunk})
+                if self.statuses:
+                    filtering.append({'field': f"{prefix}effective_status", 'operator': 'IN', 'value': self.statuses})
+                if pattern:
+                    filtering.append({'field': f"{prefix}name", 'operator': 'CONTAIN', 'value': pattern})
+                groups.append(filtering)
+
+        return groups
+
+    def insight_filtering(self):
+        """
+        Filtros para consultas de insights (campos campaign.*)
+
+        Returns:
+            list: Um valor de `filtering` por consulta necessária (vazio = sem filtro)
+        """
+        return self._groups('campaign.')
+
+    def campaign_filtering(self):
+        """
+        Filtros para a listagem de campanhas (edge /campaigns)
+
+        Returns:
+            list: Um valor de `filtering` por consulta necessária (vazio = sem filtro)
+        """
+        return self._groups('')
@@ -0,0 +1,189 @@
+"""
+Coleta hierárquica de insights do Meta Ads
+
+Os insights são pedidos uma única vez no menor grão (anúncio x dia x
+dispositivo) e os níveis conjunto de anúncios, campanha e conta são
+calculados localmente, somando as colunas com NumPy. As métricas de
+proporção (CPC, CPM, CTR, CPL, taxa de conversão) são recalculadas a partir
+das somas, e não somadas. Alcance e frequência não são aditivos entre
+anúncios e ficam vazios (None) nos níveis agregados.
+"""
+import numpy as np
+
+from src.meta_ads.parsing import ROW_COLUMNS, _round2, batch_to_rows, concat_batches
+
+
+class InsightHierarchy:
+    """Insights no nível de anúncio com agregações locais para os níveis acima"""
+
+    # Chave de agrupamento de cada nível (o dispositivo é mantido quando presente)
+    LEVEL_KEYS = {
+        'ad': ['date', 'campaign_id', 'adset_id', 'ad_id', 'impression_device'],
+        'adset': ['date', 'campaign_id', 'adset_id', 'impression_device'],
+        'campaign': ['date', 'campaign_id', 'impression_device'],
+        'account': ['date', 'impression_device'],
+    }
+
+    # Colunas somadas na agregação
+    SUM_COLUMNS = ['impressions', 'clicks', 'spend', 'conversions', 'leads']
+
+    # Métricas de pessoas únicas: não podem ser somadas entre anúncios (quem viu
+    # mais de um anúncio contaria mais de uma vez). Só o nível de anúncio as
+    # mantém; acima dele saem como None
+    UNIQUE_COLUMNS = ['reach', 'frequency']
+
+    def __init__(self, columns):
+        """
+        Args:
+            columns (dict): Lote colunar no nível de anúncio (parse_insights_batch
+                com adset_id/adset_name/ad_id/ad_name)
+        """
+        self.columns = columns
+        self.size = len(columns.get('date', []))
+        self._dimensions = None
+
+    @classmethod
+    def from_batches(cls, batches):
+        """Junta os lotes colunares gerados por MetaAdsClient.iter_insights(batches=True)"""
+        return cls(concat_batches(batches))
+
+    @property
+    def dimensions(self):
+        """
+        Tabelas de dimensão ID -> nome montadas a partir das linhas coletadas
+
+        Returns:
+            dict: {'campaign': {id: {'name'}}, 'adset': {id: {'name', 'campaign_id'}},
+                'ad': {id: {'name', 'adset_id', 'campaign_id'}}}
+        """
+        if self._dimensions is None:
+            campaigns, adsets, ads = {}, {}, {}
+            empty = [None] * self.size
+
+            for campaign_id, campaign_name, adset_id, adset_name, ad_id, ad_name in zip(
+                self.columns.get('campaign_id', empty),
+                self.columns.get('campaign_name', empty),
+                self.columns.get('adset_id', empty),
+                self.columns.get('adset_name', empty),
+                self.columns.get('ad_id', empty),
+                self.columns.get('ad_name', empty),
+            ):
+                if campaign_id and campaign_id not in campaigns:
+                    campaigns[campaign_id] = {'name': campaign_name}
+                if adset_id and adset_id not in adsets:
+                    adsets[adset_id] = {'name': adset_name, 'campaign_id': campaign_id}
+                if ad_id and ad_id not in ads:
+                    ads[ad_id] = {'name': ad_name, 'adset_id': adset_id, 'campaign_id': campaign_id}
+
+            self._dimensions = {'campaign': campaigns, 'adset': adsets, 'ad': ads}
+
+        return self._dimensions
+
+    def rollup(self, level):
+        """
+        Agrega as linhas de anúncio em um nível
+
+        Args:
+            level (str): 'ad', 'adset', 'campaign' ou 'account'
+
+        Returns:
+            dict: Lote colunar no formato de parse_insights_batch, uma linha por
+                chave do nível, com nomes vindos das tabelas de dimensão
+        """
+        if level not in self.LEVEL_KEYS:
+            raise ValueError(
+                f"Nível desconhecido: '{level}'. Use um de: {', '.join(self.LEVEL_KEYS)}"
+            )
+
+        empty = [None] * self.size
+        key_names = self.LEVEL_KEYS[level]
+        key_columns = [self.columns.get(name, empty) for name in key_names]
+
+        # Fatoração das chaves: código inteiro por combinação distinta, na ordem de aparição
+        groups = {}
+        codes = np.fromiter(
+            (groups.setdefault(key, len(groups)) for key in zip(*key_columns)),
+            dtype=np.int64,
+            count=self.size
+        )
+        count = len(groups)
+        keys = list(zip(*groups)) if groups else [[] for _ in key_names]
+
+        result = {name: list(values) for name, values in zip(key_names, keys)}
+
+        for name in self.SUM_COLUMNS:
+            if name in self.columns:
+                summed = np.bincount(codes, weights=self.columns[name], minlength=count)
+                result[name] = summed.astype(np.int64) if name != 'spend' else summed
+
+        if level == 'ad':
+            # Uma linha de anúncio por chave: o alcance é o informado pelo Meta
+            # (a frequência é recalculada em _add_ratios)
+            if 'reach' in self.columns:
+                result['reach'] = np.bincount(codes, weights=self.columns['reach'], minlength=count).astype(np.int64)
+        else:
+            for name in self.UNIQUE_COLUMNS:
+                if name in self.columns:
+                    result[name] = [None] * count
+
+        self._add_names(result, level)
+        self._add_ratios(result, count)
+        result['platform'] = ['Meta Ads'] * count
+
+        # Ordena por data, como nas consultas da API
+        order = sorted(range(count), key=lambda index: result['date'][index])
+        ordered = {}
+        for name in ROW_COLUMNS:
+            if name in result:
+                column = result[name]
+                if isinstance(column, np.ndarray):
+                    ordered[name] = column[order]
+                else:
+                    ordered[name] = [column[index] for index in order]
+
+        return ordered
+
+    def _add_names(self, result, level):
+        dimensions = self.dimensions
+
+        if level != 'account':
+            result['campaign_name'] = [
+                dimensions['campaign'].get(campaign_id, {}).get('name')
+                for campaign_id in result['campaign_id']
+            ]
+        if level in ('adset', 'ad'):
+            result['adset_name'] = [
+                dimensions['adset'].get(adset_id, {}).get('name')
+                for adset_id in result['adset_id']
+            ]
+        if level == 'ad':
+            result['ad_name'] = [
+                dimensions['ad'].get(ad_id, {}).get('name')
+                for ad_id in result['ad_id']
+            ]
+
+    @staticmethod
+    def _add_ratios(result, count):
+        """Recalcula as métricas de proporção a partir das somas"""
+        def ratio(numerator, denominator, scale=1):
+            return np.divide(
+                result[numerator] * scale, result[denominator],
+                out=np.zeros(count), where=result[denominator] > 0
+            )
+
+        if 'spend' in result and 'clicks' in result:
+            result['cpc'] = ratio('spend', 'clicks')
+        if 'spend' in result and 'impressions' in result:
+            result['cpm'] = ratio('spend', 'impressions', 1000)
+        if 'clicks' in result and 'impressions' in result:
+            result['ctr'] = ratio('clicks', 'impressions', 100)
+        if 'impressions' in result and isinstance(result.get('reach'), np.ndarray):
+            result['frequency'] = ratio('impressions', 'reach')
+        if 'spend' in result and 'leads' in result:
+            result['cpl'] = _round2(ratio('spend', 'leads'))
+        if 'conversions' in result and 'clicks' in result:
+            result['conversion_rate'] = _round2(ratio('conversions', 'clicks', 100))
+
+    def rows(self, level):
+        """Registros (lista de dicionários) de um nível"""
+        return batch_to_rows(self.rollup(level))
@@ -0,0 +1,287 @@
+"""
+Normalização dos insights do Meta Ads
+
+Duas saídas para a mesma página de insights, conforme quem consome:
+parse_insights_batch monta colunas NumPy de uma só vez (cubo e hierarquia,
+que agregam colunas) e parse_insights_rows monta os registros direto
+(get_insights, store, planilha), sem ida e volta pelo formato colunar. A
+classificação de action_type (lead / conversão) é feita uma única vez por
+tipo distinto e guardada em uma tabela de consulta.
+"""
+from functools import lru_cache
+from operator import itemgetter
+
+import numpy as np
+
+# Tipos de ação classificados
+ACTION_OTHER = 0
+ACTION_LEAD = 1
+ACTION_CONVERSION = 2
+
+# Colunas de texto: nome no registro -> campo da API
+TEXT_COLUMNS = {
+    'date': 'date_start',
+    'campaign_id': 'campaign_id',
+    'campaign_name': 'campaign_name',
+    'impression_device': 'impression_device',
+}
+
+# Colunas de hierarquia (conjunto/anúncio): só entram quando pedidas em fields
+HIERARCHY_COLUMNS = ['adset_id', 'adset_name', 'ad_id', 'ad_name']
+
+# Breakdowns além de impression_device: só entram quando pedidos
+BREAKDOWN_COLUMNS = ['publisher_platform', 'platform_position', 'age', 'gender', 'region', 'country']
+
+# Breakdown horário (fuso da conta); vira a coluna 'hour' ('HH:MM')
+HOURLY_BREAKDOWN = 'hourly_stats_aggregated_by_advertiser_time_zone'
+
+# Colunas que identificam uma linha (entidade x dia x breakdowns)
+KEY_COLUMNS = ['date', 'campaign_id', 'adset_id', 'ad_id', 'impression_device'] + BREAKDOWN_COLUMNS + ['hour']
+
+INT_COLUMNS = ['impressions', 'clicks', 'reach']
+
+FLOAT_COLUMNS = ['spend', 'frequency', 'cpc', 'cpm', 'ctr']
+
+# Ordem das colunas nos registros normalizados
+ROW_COLUMNS = (
+    list(TEXT_COLUMNS) + HIERARCHY_COLUMNS + BREAKDOWN_COLUMNS + ['hour', 'impressions', 'clicks', 'spend', 'reach', 'frequency', 'cpc', 'cpm', 'ctr']
+    + ['conversions', 'leads', 'platform', 'cpl', 'conversion_rate']
+)
+
+
+@lru_cache(maxsize=None)
+def classify_action_type(action_type):
+    """
+    Classifica um action_type da API
+
+    Returns:
+        int: ACTION_LEAD, ACTION_CONVERSION ou ACTION_OTHER
+    """
+    action_type = action_type.lower()
+
+    if 'lead' in action_type:
+        return ACTION_LEAD
+    if 'conversion' in action_type or 'purchase' in action_type:
+        return ACTION_CONVERSION
+    return ACTION_OTHER
+
+
+def _round2(values):
+    """
+    Arredonda para 2 casas com o mesmo resultado de round() do Python
+
+    np.round pode divergir de round() quando o valor está perto de x,xx5
+    (round() usa a representação decimal exata); esses casos são refeitos
+    individualmente.
+    """
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+
+    if near_tie.any():
+        rounded[near_tie] = [round(value, 2) for value in values[near_tie].tolist()]
+
+    return rounded
+
+
+def _raw(insight):
+    """Dicionário bruto do insight (evita o __getitem__ lento dos objetos do SDK)"""
+    return getattr(insight, '_data', insight)
+
+
+def parse_insights_batch(insights, fields=None, breakdowns=None):
+    """
+    Normaliza um lote de insights em formato colunar
+
+    Args:
+        insights (list): Insights da API (AdsInsights ou dicionários)
+        fields (list): Campos pedidos à API; só as colunas desses campos (e as
+            métricas derivadas possíveis a partir deles) são montadas. None = todas
+        breakdowns (list): Breakdowns pedidos à API (colunas de BREAKDOWN_COLUMNS
+            e 'hour' para HOURLY_BREAKDOWN)
+
+    Returns:
+        dict: Nome da coluna -> lista (texto) ou np.ndarray (números)
+    """
+    records = [_raw(insight) for insight in insights]
+    size = len(records)
+
+    columns = {}
+
+    for name, field in TEXT_COLUMNS.items():
+        columns[name] = [record.get(field) for record in records]
+
+    for name in HIERARCHY_COLUMNS:
+        if fields is not None and name in fields:
+            columns[name] = [record.get(name) for record in records]
+
+    for name in BREAKDOWN_COLUMNS:
+        if breakdowns and name in breakdowns:
+            columns[name] = [record.get(name) for record in records]
+
+    if breakdowns and HOURLY_BREAKDOWN in breakdowns:
+        # '13:00:00 - 13:59:59' -> '13:00'
+        columns['hour'] = [(record.get(HOURLY_BREAKDOWN) or '')[:5] or None for record in records]
+
+    # NumPy converte as strings da API direto para número, em uma matriz única
+    numeric_names = [
+        name for name in INT_COLUMNS + FLOAT_COLUMNS
+        if fields is None or name in fields
+    ]
+    if numeric_names:
+        try:
+            getter = itemgetter(*numeric_names)
+            numeric = np.array([getter(record) for record in records], dtype=np.float64)
+        except KeyError:
+            # Algum registro sem métrica (a API omite campos zerados): caminho com padrão 0
+            numeric = np.array(
+                [[record.get(name, 0) for name in numeric_names] for record in records],
+                dtype=np.float64
+            )
+        numeric = numeric.reshape(size, len(numeric_names))
+
+        for position, name in enumerate(numeric_names):
+            column = numeric[:, position]
+            columns[name] = column.astype(np.int64) if name in INT_COLUMNS else column
+
+    if fields is None or 'actions' in fields:
+        # Ações achatadas: (linha, tipo, valor)
+        action_rows = []
+        action_kinds = []
+        action_values = []
+
+        for index, record in enumerate(records):
+            for action in record.get('actions') or ():
+                action_rows.append(index)
+                action_kinds.append(classify_action_type(action.get('action_type', '')))
+                action_values.append(action.get('value', 0))
+
+        action_rows = np.array(action_rows, dtype=np.int64)
+        action_kinds = np.array(action_kinds, dtype=np.int8)
+        action_values = np.array(action_values, dtype=np.int64)
+
+        for name, kind in (('conversions', ACTION_CONVERSION), ('leads', ACTION_LEAD)):
+            mask = action_kinds == kind
+            columns[name] = np.bincount(
+                action_rows[mask],
+                weights=action_values[mask],
+                minlength=size
+            ).astype(np.int64)
+
+    # Métricas derivadas (quando os campos de origem foram pedidos)
+    if 'spend' in columns and 'leads' in columns:
+        leads = columns['leads']
+        columns['cpl'] = _round2(
+            np.divide(columns['spend'], leads, out=np.zeros(size), where=leads > 0)
+        )
+
+    if 'clicks' in columns and 'conversions' in columns:
+        clicks = columns['clicks']
+        columns['conversion_rate'] = _round2(
+            np.divide(columns['conversions'], clicks, out=np.zeros(size), where=clicks > 0) * 100
+        )
+
+    columns['platform'] = ['Meta Ads'] * size
+
+    return {name: columns[name] for name in ROW_COLUMNS if name in columns}
+
+
+def concat_batches(batches):
+    """
+    Junta lotes colunares em um único lote
+
+    Returns:
+        dict: Colunas concatenadas (np.ndarray continua np.ndarray)
+    """
+    merged = {}
+
+    for batch in batches:
+        for name, column in batch.items():
+            merged.setdefault(name, []).append(column)
+
+    return {
+        name: (
+            np.concatenate(parts) if isinstance(parts[0], np.ndarray)
+            else [value for part in parts for value in part]
+        )
+        for name, parts in merged.items()
+    }
+
+
+def batch_to_rows(columns):
+    """
+    Converte um lote colunar de volta para lista de dicionários
+
+    Returns:
+        list: Registros no formato de MetaAdsClient.get_insights
+    """
+    names = list(columns)
+    values = [
+        column.tolist() if isinstance(column, np.ndarray) else column
+        for column in columns.values()
+    ]
+
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def parse_insights_rows(insights, fields=None, breakdowns=None):
+    """
+    Normaliza insights direto em registros (sem passar pelo formato colunar)
+
+    Mesmas colunas e valores de batch_to_rows(parse_insights_batch(...)), para
+    quem consome dicionários (get_insights, store, planilha). O plano de
+    colunas é montado uma vez por página e action_type é classificado pela
+    tabela em cache.
+
+    Returns:
+        list: Registros no formato de MetaAdsClient.get_insights
+    """
+    text = list(TEXT_COLUMNS.items())
+    text += [(name, name) for name in HIERARCHY_COLUMNS if fields is not None and name in fields]
+    text += [(name, name) for name in BREAKDOWN_COLUMNS if breakdowns and name in breakdowns]
+    hourly = bool(breakdowns) and HOURLY_BREAKDOWN in breakdowns
+
+    numeric = [
+        (name, int if name in INT_COLUMNS else float)
+        for name in ROW_COLUMNS
+        if (name in INT_COLUMNS or name in FLOAT_COLUMNS) and (fields is None or name in fields)
+    ]
+    names = {name for name, _ in numeric}
+    with_actions = fields is None or 'actions' in fields
+    with_cpl = with_actions and 'spend' in names
+    with_rate = with_actions and 'clicks' in names
+
+    rows = []
+    for insight in insights:
+        get = _raw(insight).get
+        row = {name: get(field) for name, field in text}
+
+        if hourly:
+            row['hour'] = (get(HOURLY_BREAKDOWN) or '')[:5] or None
+
+        for name, convert in numeric:
+            row[name] = convert(get(name, 0))
+
+        if with_actions:
+            conversions = 0
+            leads = 0
+            for action in get('actions') or ():
+                kind = classify_action_type(action.get('action_type', ''))
+                if kind == ACTION_LEAD:
+                    leads += int(action.get('value', 0))
+                elif kind == ACTION_CONVERSION:
+                    conversions += int(action.get('value', 0))
+            row['conversions'] = conversions
+            row['leads'] = leads
+
+        row['platform'] = 'Meta Ads'
+
+        if with_cpl:
+            row['cpl'] = round(row['spend'] / leads, 2) if leads > 0 else 0.0
+        if with_rate:
+            clicks = row['clicks']
+            row['conversion_rate'] = round(conversions / clicks * 100, 2) if clicks > 0 else 0.0
+
+        rows.append(row)
+
+    return rows
@@ -0,0 +1,303 @@
+"""
+Controle de taxa das chamadas à Graph API do Meta
+
+O limite de chamadas do Meta é por aplicativo, então todas as coletas do
+processo (várias contas, janelas em paralelo) compartilham um único
+orçamento de chamadas e um único governador de concorrência.
+"""
+import sys
+import json
+import time
+import threading
+from pathlib import Path
+from facebook_business.exceptions import FacebookRequestError
+
+# Adicionar o diretório raiz ao path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from config.settings import META_ADS_CONFIG
+
+
+class CallBudget:
+    """Token bucket de chamadas por hora, compartilhado entre threads"""
+
+    def __init__(self, calls_per_hour):
+        """
+        Args:
+            calls_per_hour (int): Chamadas permitidas por hora (0 = sem limite)
+        """
+        self.calls_per_hour = calls_per_hour
+        self.capacity = float(calls_per_hour)
+        self.tokens = float(calls_per_hour)
+        self.refill_per_second = calls_per_hour / 3600
+        self.updated_at = time.monotonic()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def acquire(self):
+        """Consome uma chamada do orçamento, aguardando se ele estiver esgotado"""
+        if not self.calls_per_hour:
+            with self._lock:
+                self.calls += 1
+            return
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.calls += 1
+                    return
+                wait = (1 - self.tokens) / self.refill_per_second
+
+            time.sleep(wait)
+
+    def install(self, api):
+        """
+        Faz todas as chamadas de uma instância de FacebookAdsApi passarem pelo orçamento
+
+        Cursores, relatórios assíncronos e lotes do SDK usam api.call, então
+        cada página conta como uma chamada.
+        """
+        if getattr(api, '_call_budget', None) is self:
+            return api
+
+        call = api.call
+
+        def budgeted_call(*args, **kwargs):
+            self.acquire()
+            return call(*args, **kwargs)
+
+        api.call = budgeted_call
+        api._call_budget = self
+        return api
+
+
+class RequestGovernor:
+    """
+    Ajusta a concorrência das chamadas à Graph API pelo uso informado pelo Meta
+
+    Após cada resposta são lidos os cabeçalhos x-app-usage,
+    x-business-use-case-usage e x-ad-account-usage (percentuais de uso do
+    limite). Com uso baixo a concorrência sobe de um em um; acima de
+    slowdown_pct ela cai pela metade; acima de pause_pct novas chamadas
+    aguardam antes de sair, para não chegar ao bloqueio do limite (que dura
+    até uma hora). Erros de limite ainda assim recebidos são repetidos após a
+    pausa indicada pela API.
+    """
+
+    USAGE_HEADERS = ('x-app-usage', 'x-business-use-case-usage', 'x-ad-account-usage')
+
+    # Códigos de erro de limite de chamadas da Graph API
+    THROTTLE_ERROR_CODES = {4, 17, 32, 613} | set(range(80000, 80015))
+
+    # Pausa (segundos) quando o uso passa de pause_pct sem previsão da API
+    PAUSE_SECONDS = 60
+
+    def __init__(self, max_concurrency, slowdown_pct=75, pause_pct=90, max_retries=3):
+        """
+        Args:
+            max_concurrency (int): Máximo de chamadas simultâneas
+            slowdown_pct (float): Uso (%) a partir do qual a concorrência é reduzida
+            pause_pct (float): Uso (%) a partir do qual as chamadas são pausadas
+            max_retries (int): Repetições de uma chamada recusada por limite
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = self.max_concurrency
+        self.slowdown_pct = slowdown_pct
+        self.pause_pct = pause_pct
+        self.max_retries = max_retries
+        self.active = 0
+        self.usage_pct = 0.0
+        self.usage = {}
+        self.paused_until = 0.0
+        self.calls = 0
+        self.throttled = 0
+        self.paused_seconds = 0.0
+        self._cond = threading.Condition()
+
+    @staticmethod
+    def parse_usage(headers):
+        """
+        Lê os cabeçalhos de uso de uma resposta
+
+        Returns:
+            tuple: (uso por cabeçalho em %, minutos até recuperar o acesso)
+        """
+        if isinstance(headers, list):
+            # Respostas de lote trazem os cabeçalhos como [{'name': ..., 'value': ...}]
+            headers = {header.get('name'): header.get('value') for header in headers}
+        headers = {str(name).lower(): value for name, value in (headers or {}).items()}
+        usage = {}
+        regain_minutes = 0
+
+        for name in RequestGovernor.USAGE_HEADERS:
+            try:
+                payload = json.loads(headers[name])
+            except (KeyError, TypeError, ValueError):
+                continue
+
+            # x-business-use-case-usage: {business_id: [{type, call_count, ...}]}
+            if name == 'x-business-use-case-usage':
+                entries = [entry for values in payload.values() for entry in values]
+            else:
+                entries = [payload]
+
+            for entry in entries:
+                percentages = [
+                    float(value) for key, value in entry.items()
+                    if key in ('call_count', 'total_cputime', 'total_time', 'acc_id_util_pct')
+                ]
+                if percentages:
+                    usage[name] = max(usage.get(name, 0.0), *percentages)
+                # reset_time_duration vem em respostas normais (tempo até o uso
+                # zerar) e não indica bloqueio; só o tempo para recuperar o acesso indica
+                regain_minutes = max(
+                    regain_minutes,
+                    float(entry.get('estimated_time_to_regain_access') or 0),
+                )
+
+        return usage, regain_minutes
+
+    def observe(self, headers):
+        """Atualiza uso, concorrência e pausa a partir dos cabeçalhos de uma resposta"""
+        usage, regain_minutes = self.parse_usage(headers)
+        if not usage and not regain_minutes:
+            return
+
+        with self._cond:
+            self.usage.update(usage)
+            self.usage_pct = max(usage.values(), default=self.usage_pct)
+
+            if self.usage_pct >= self.pause_pct or regain_minutes:
+                self.concurrency = 1
+                self._pause(regain_minutes * 60 or self.PAUSE_SECONDS)
+            elif self.usage_pct >= self.slowdown_pct:
+                self.concurrency = max(1, self.concurrency // 2)
+            elif self.usage_pct < self.slowdown_pct / 2:
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+
+            self._cond.notify_all()
+
+    def _pause(self, seconds):
+        until = time.monotonic() + seconds
+        if until > self.paused_until:
+            self.paused_seconds += until - max(self.paused_until, time.monotonic())
+            self.paused_until = until
+
+    def is_throttle_error(self, error):
+        return (
+            isinstance(error, FacebookRequestError)
+            and error.api_error_code() in self.THROTTLE_ERROR_CODES
+        )
+
+    def acquire(self):
+        """Aguarda uma vaga de concorrência (e o fim de uma pausa em andamento)"""
+        with self._cond:
+            while True:
+                wait = self.paused_until - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                elif self.active < self.concurrency:
+                    self.active += 1
+                    self.calls += 1
+                    return
+                else:
+                    self._cond.wait()
+
+    def release(self):
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    def metrics(self):
+        """
+        Situação atual do limite de chamadas
+
+        Returns:
+            dict: usage_pct, usage (por cabeçalho), concurrency, active, calls,
+                throttled, paused_seconds e pause_remaining
+        """
+        with self._cond:
+            return {
+                'usage_pct': round(self.usage_pct, 1),
+                'usage': dict(self.usage),
+                'concurrency': self.concurrency,
+                'max_concurrency': self.max_concurrency,
+                'active': self.active,
+                'calls': self.calls,
+                'throttled': self.throttled,
+                'paused_seconds': round(self.paused_seconds, 1),
+                'pause_remaining': round(max(0.0, self.paused_until - time.monotonic()), 1),
+            }
+
+    def install(self, api):
+        """Faz todas as chamadas de uma instância de FacebookAdsApi passarem pelo governador"""
+        if getattr(api, '_request_governor', None) is self:
+            return api
+
+        call = api.call
+
+        def governed_call(*args, **kwargs):
+            for attempt in range(self.max_retries + 1):
+                self.acquire()
+                try:
+                    response = call(*args, **kwargs)
+                except FacebookRequestError as e:
+                    self.observe(e.http_headers())
+                    if not self.is_throttle_error(e) or attempt == self.max_retries:
+                        raise
+                    with self._cond:
+                        self.throttled += 1
+                        self.concurrency = 1
+                        if self.paused_until <= time.monotonic():
+                            self._pause(self.PAUSE_SECONDS * (attempt + 1))
+                    print(f"⚠️  Limite de chamadas do Meta atingido, nova tentativa em breve ({attempt + 1}/{self.max_retries})")
+                    continue
+                finally:
+                    self.release()
+
+                self.observe(response.headers())
+                return response
+
+        api.call = governed_call
+        api._request_governor = self
+        return api
+
+
+
+_app_budget = None
+_app_budget_lock = threading.Lock()
+
+
+def get_app_budget():
+    """Orçamento de chamadas do aplicativo (um por processo, META_RATE_LIMIT_CALLS_PER_HOUR)"""
+    global _app_budget
+
+    with _app_budget_lock:
+        if _app_budget is None:
+            _app_budget = CallBudget(META_ADS_CONFIG['rate_limit_calls_per_hour'])
+        return _app_budget
+
+
+_app_governor = None
+_app_governor_lock = threading.Lock()
+
+
+def get_app_governor():
+    """Governador de concorrência do aplicativo (um por processo, META_MAX_CONCURRENCY)"""
+    global _app_governor
+
+    with _app_governor_lock:
+        if _app_governor is None:
+            _app_governor = RequestGovernor(
+                META_ADS_CONFIG['max_concurrency'],
+                slowdown_pct=META_ADS_CONFIG['usage_slowdown_pct'],
+                pause_pct=META_ADS_CONFIG['usage_pause_pct'],
+            )
+        return _app_governor
@@ -0,0 +1,57 @@
+"""
+Registro de clientes do Meta Ads compartilhados pelo processo
+
+Criar um MetaAdsClient chama FacebookAdsApi.init e abre novas conexões TLS.
+O registro guarda um cliente por (token, contas, banco local) e o devolve
+nas chamadas seguintes, então a sessão HTTP keep-alive é montada uma vez por
+processo, e não a cada recarga do dashboard.
+
+No Streamlit, use dentro de uma função com @st.cache_resource.
+"""
+import sys
+import threading
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from config.settings import META_ADS_CONFIG
+from src.meta_ads.client import MetaAdsClient
+from src.meta_ads.store import InsightStore
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(ad_account_ids=None, with_store=False, db_path=None):
+    """
+    Cliente do Meta Ads compartilhado pelo processo
+
+    Args:
+        ad_account_ids (list): Contas de anúncios (padrão: META_AD_ACCOUNT_IDS)
+        with_store (bool): Associa um InsightStore ao cliente
+        db_path (Path): Banco do InsightStore (padrão: DATA_DIR/meta_insights.db)
+
+    Returns:
+        MetaAdsClient: O mesmo objeto para os mesmos argumentos
+    """
+    account_ids = tuple(ad_account_ids or META_ADS_CONFIG['ad_account_ids'])
+    key = (
+        META_ADS_CONFIG['access_token'],
+        account_ids,
+        str(db_path) if with_store else None,
+    )
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            store = InsightStore(db_path) if with_store else None
+            client = MetaAdsClient(store=store, ad_account_ids=list(account_ids))
+            _clients[key] = client
+        return client
+
+
+def clear_clients():
+    """Descarta os clientes registrados (ex.: após trocar o token)"""
+    with _clients_lock:
+        _clients.clear()
@@ -0,0 +1,292 @@
+"""
+Armazenamento local (SQLite) dos insights do Meta Ads
+
+Os registros ficam em DATA_DIR/meta_insights.db, indexados por
+(conta, nível, data, campanha, conjunto, anúncio, dispositivo). Consultas por período são
+respondidas localmente e os dados sobrevivem a reinícios do Streamlit e à
+limpeza do st.cache_data.
+"""
+import sys
+import sqlite3
+from pathlib import Path
+from itertools import islice
+from contextlib import closing
+
+# Adicionar o diretório raiz ao path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from config.settings import DATA_DIR
+
+
+class InsightStore:
+    """Armazena e consulta insights do Meta Ads em um banco SQLite local"""
+
+    # Colunas que compõem a chave de cada registro
+    KEY_COLUMNS = ['account_id', 'level', 'date', 'campaign_id', 'adset_id', 'ad_id', 'impression_device']
+
+    # IDs abaixo de campanha: vazios nos níveis conta/campanha, omitidos dos registros lidos
+    ENTITY_COLUMNS = ['adset_id', 'ad_id']
+
+    # Colunas de dados (mesmo formato das linhas de MetaAdsClient.get_insights)
+    VALUE_COLUMNS = [
+        ('campaign_name', 'TEXT'),
+        ('impressions', 'INTEGER'),
+        ('clicks', 'INTEGER'),
+        ('spend', 'REAL'),
+        ('reach', 'INTEGER'),
+        ('frequency', 'REAL'),
+        ('cpc', 'REAL'),
+        ('cpm', 'REAL'),
+        ('ctr', 'REAL'),
+        ('conversions', 'INTEGER'),
+        ('leads', 'INTEGER'),
+        ('cpl', 'REAL'),
+        ('conversion_rate', 'REAL'),
+        ('platform', 'TEXT'),
+    ]
+
+    # Registros gravados por transação em replace_range
+    WRITE_CHUNK_SIZE = 500
+
+    def __init__(self, db_path=None):
+        """
+        Args:
+            db_path (Path): Caminho do banco (padrão: DATA_DIR/meta_insights.db)
+        """
+        self.db_path = Path(db_path) if db_path else DATA_DIR / 'meta_insights.db'
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._create_tables()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _create_tables(self):
+        value_columns = ',\n'.join(f"{name} {kind}" for name, kind in self.VALUE_COLUMNS)
+
+        with closing(self._connect()) as conn:
+            conn.execute('BEGIN')
+            with conn:
+                # WITHOUT ROWID: tabela ordenada fisicamente pela chave (conta, nível, data, ...)
+                self._create_table(conn, 'insights', f"""
+                    account_id TEXT NOT NULL,
+                    level TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    campaign_id TEXT NOT NULL DEFAULT '',
+                    adset_id TEXT NOT NULL DEFAULT '',
+                    ad_id TEXT NOT NULL DEFAULT '',
+                    impression_device TEXT NOT NULL DEFAULT '',
+                    {value_columns},
+                    PRIMARY KEY (account_id, level, date, campaign_id, adset_id, ad_id, impression_device)
+                """)
+                # Linhas horárias (modo intradiário), ao lado das diárias
+                self._create_table(conn, 'insights_hourly', f"""
+                    account_id TEXT NOT NULL,
+                    level TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    hour TEXT NOT NULL,
+                    campaign_id TEXT NOT NULL DEFAULT '',
+                    adset_id TEXT NOT NULL DEFAULT '',
+                    ad_id TEXT NOT NULL DEFAULT '',
+                    {value_columns},
+                    PRIMARY KEY (account_id, level, date, hour, campaign_id, adset_id, ad_id)
+                """)
+
+    @classmethod
+    def _create_table(cls, conn, table, definition):
+        """
+        Cria a tabela; bancos antigos (chave sem conjunto/anúncio) são migrados
+
+        Na chave antiga, os anúncios de uma mesma campanha se sobrescreviam:
+        as linhas dos níveis conjunto/anúncio estão incompletas e são
+        descartadas (a sincronização as recoleta, ver InsightSync._reusable).
+        """
+        existing = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+        if existing and 'ad_id' not in existing:
+            conn.execute(f"ALTER TABLE {table} RENAME TO {table}_v1")
+            conn.execute(f"CREATE TABLE {table} ({definition}) WITHOUT ROWID")
+            conn.execute(
+                f"INSERT INTO {table} ({', '.join(existing)}) SELECT {', '.join(existing)} FROM {table}_v1 "
+                "WHERE level NOT IN ('adset', 'ad', 'adset_total', 'ad_total')"
+            )
+            conn.execute(f"DROP TABLE {table}_v1")
+            print(f"🔧 Tabela {table} migrada para a chave com conjunto/anúncio")
+        else:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({definition}) WITHOUT ROWID")
+
+    @property
+    def hourly_columns(self):
+        return (
+            ['account_id', 'level', 'date', 'hour', 'campaign_id'] + self.ENTITY_COLUMNS
+            + [name for name, _ in self.VALUE_COLUMNS]
+        )
+
+    @property
+    def columns(self):
+        return self.KEY_COLUMNS + [name for name, _ in self.VALUE_COLUMNS]
+
+    def _to_record(self, account_id, level, row):
+        return (
+            account_id,
+            level,
+            row['date'],
+            row.get('campaign_id') or '',
+            row.get('adset_id') or '',
+            row.get('ad_id') or '',
+            row.get('impression_device') or '',
+        ) + tuple(row.get(name) for name, _ in self.VALUE_COLUMNS)
+
+    def upsert(self, account_id, level, rows):
+        """
+        Insere ou substitui registros pela chave
+
+        Args:
+            account_id (str): ID da conta de anúncios
+            level (str): Nível dos dados ('account', 'campaign', 'adset', 'ad')
+            rows (list): Registros no formato de MetaAdsClient.get_insights
+
+        Returns:
+            int: Quantidade de registros gravados
+        """
+        records = [self._to_record(account_id, level, row) for row in rows]
+        placeholders = ', '.join('?' * len(self.columns))
+
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO insights ({', '.join(self.columns)}) VALUES ({placeholders})",
+                records
+            )
+
+        return len(records)
+
+    def replace_range(self, account_id, level, date_from, date_to, rows):
+        """
+        Substitui todos os registros do período por rows
+
+        Útil quando a coleta do período é completa: linhas que deixaram de
+        existir na API (ex.: campanha sem entrega) também somem do banco.
+
+        rows pode ser um gerador (ex.: MetaAdsClient.iter_insights): os registros
+        são gravados em blocos de WRITE_CHUNK_SIZE, cada um em sua transação,
+        sem manter o período inteiro em memória nem o banco travado durante a
+        coleta. Se a coleta falhar no meio, o período fica parcial até a
+        próxima sincronização.
+
+        Returns:
+            int: Quantidade de registros gravados
+        """
+        rows = iter(rows)
+        placeholders = ', '.join('?' * len(self.columns))
+        insert = f"INSERT OR REPLACE INTO insights ({', '.join(self.columns)}) VALUES ({placeholders})"
+
+        chunk = [self._to_record(account_id, level, row) for row in islice(rows, self.WRITE_CHUNK_SIZE)]
+        written = len(chunk)
+
+        # Primeiro bloco na mesma transação da limpeza do período
+        with closing(self._connect()) as conn:
+            with conn:
+                conn.execute(
+                    "DELETE FROM insights WHERE account_id = ? AND level = ? AND date BETWEEN ? AND ?",
+                    (account_id, level, date_from, date_to)
+                )
+                conn.executemany(insert, chunk)
+
+            while True:
+                chunk = [
+                    self._to_record(account_id, level, row)
+                    for row in islice(rows, self.WRITE_CHUNK_SIZE)
+                ]
+                if not chunk:
+                    break
+                with conn:
+                    conn.executemany(insert, chunk)
+                written += len(chunk)
+
+        return written
+
+    def query(self, account_id, level, date_from, date_to):
+        """
+        Consulta registros do período
+
+        Returns:
+            list: Registros no formato de MetaAdsClient.get_insights, ordenados por data
+        """
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(
+                f"""
+                SELECT {', '.join(self.columns[2:])} FROM insights
+                WHERE account_id = ? AND level = ? AND date BETWEEN ? AND ?
+                ORDER BY date, campaign_id, adset_id, ad_id, impression_device
+                """,
+                (account_id, level, date_from, date_to)
+            )
+            rows = [dict(row) for row in cursor]
+
+        for row in rows:
+            row['campaign_id'] = row['campaign_id'] or None
+            row['impression_device'] = row['impression_device'] or None
+            self._drop_empty_ids(row)
+
+        return rows
+
+    def _drop_empty_ids(self, row):
+        """Remove adset_id/ad_id vazios (níveis conta/campanha), como nos registros da API"""
+        for name in self.ENTITY_COLUMNS:
+            if not row[name]:
+                del row[name]
+
+    def replace_hours(self, account_id, level, date, rows):
+        """
+        Substitui as linhas horárias de um dia
+
+        Returns:
+            int: Quantidade de registros gravados
+        """
+        records = [
+            (account_id, level, row['date'], row.get('hour') or '', row.get('campaign_id') or '')
+            + tuple(row.get(name) or '' for name in self.ENTITY_COLUMNS)
+            + tuple(row.get(name) for name, _ in self.VALUE_COLUMNS)
+            for row in rows
+        ]
+        placeholders = ', '.join('?' * len(self.hourly_columns))
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "DELETE FROM insights_hourly WHERE account_id = ? AND level = ? AND date = ?",
+                (account_id, level, date)
+            )
+            conn.executemany(
+                f"INSERT OR REPLACE INTO insights_hourly ({', '.join(self.hourly_columns)}) VALUES ({placeholders})",
+                records
+            )
+
+        return len(records)
+
+    def query_hours(self, account_id, level, date_from, date_to):
+        """
+        Consulta linhas horárias do período
+
+        Returns:
+            list: Registros com 'hour', ordenados por data e hora
+        """
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(
+                f"""
+                SELECT {', '.join(self.hourly_columns[2:])} FROM insights_hourly
+                WHERE account_id = ? AND level = ? AND date BETWEEN ? AND ?
+                ORDER BY date, hour, campaign_id, adset_id, ad_id
+                """,
+                (account_id, level, date_from, date_to)
+            )
+            rows = [dict(row) for row in cursor]
+
+        for row in rows:
+            row['campaign_id'] = row['campaign_id'] or None
+            self._drop_empty_ids(row)
+
+        return rows
@@ -0,0 +1,375 @@
+"""
+Sincronização incremental de insights do Meta Ads
+
+Mantém, por (conta, nível), uma marca d'água em disco com o período já
+coletado. A cada sincronização só são pedidos à API os dias posteriores à
+marca d'água mais uma janela de reprocessamento (os últimos dias ainda podem
+mudar por causa da atribuição de conversões). O histórico fica no
+InsightStore local.
+
+Antes de recoletar a janela de reprocessamento, uma consulta barata no nível
+conta (sem breakdown) gera um hash por dia; só os dias cujo hash mudou desde
+a última coleta são pedidos de novo no grão completo.
+"""
+import sys
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# Adicionar o diretório raiz ao path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from config.settings import META_ADS_CONFIG, DATA_DIR
+from src.meta_ads.store import InsightStore
+
+
+class InsightSync:
+    """Sincroniza insights do Meta Ads de forma incremental com histórico local"""
+
+    # Hash de um dia sem entrega (a sonda não retorna linha para ele)
+    EMPTY_DAY_HASH = 'vazio'
+
+    # Execuções mantidas em sync_stats.jsonl (as mais antigas são descartadas)
+    STATS_MAX_RUNS = 500
+
+    def __init__(self, client, restatement_days=None, data_dir=None):
+        """
+        Args:
+            client (MetaAdsClient): Cliente usado para buscar os insights; se ele não
+                tiver um InsightStore, um store padrão em DATA_DIR é associado a ele
+            restatement_days (int): Dias finais sempre recoletados (padrão: META_RESTATEMENT_DAYS)
+            data_dir (Path): Diretório dos arquivos de sincronização (padrão: DATA_DIR/meta_ads)
+        """
+        self.client = client
+        if self.client.store is None:
+            self.client.store = InsightStore()
+        self.store = self.client.store
+        self.restatement_days = (
+            META_ADS_CONFIG['restatement_days'] if restatement_days is None else restatement_days
+        )
+        self.data_dir = Path(data_dir) if data_dir else DATA_DIR / 'meta_ads'
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.watermark_file = self.data_dir / 'watermarks.json'
+        self.hash_file = self.data_dir / 'day_hashes.json'
+        self.stats_file = self.data_dir / 'sync_stats.jsonl'
+
+    @staticmethod
+    def _key(account_id, level):
+        return f"{account_id}|{level}"
+
+    @staticmethod
+    def store_level(level, breakdowns=('impression_device',)):
+        """
+        Nível usado no store e nas marcas d'água para um conjunto de breakdowns
+
+        Linhas sem breakdown ficam separadas das linhas por dispositivo
+        (ex.: 'account_total'), para não serem somadas juntas.
+        """
+        breakdowns = tuple(breakdowns)
+        if breakdowns == ('impression_device',):
+            return level
+        if not breakdowns:
+            return f"{level}_total"
+        raise ValueError("Sincronização suporta só o breakdown por dispositivo ou nenhum breakdown")
+
+    @staticmethod
+    def _shift(date, days):
+        """Soma dias a uma data 'YYYY-MM-DD'"""
+        return (datetime.strptime(date, '%Y-%m-%d') + timedelta(days=days)).strftime('%Y-%m-%d')
+
+    @staticmethod
+    def _write_json(path, payload):
+        """Grava JSON de forma atômica (arquivo temporário + rename)"""
+        tmp = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+        tmp.replace(path)
+
+    def _load_watermarks(self):
+        if not self.watermark_file.exists():
+            return {}
+        with open(self.watermark_file, encoding='utf-8') as f:
+            return json.load(f)
+
+    def get_watermark(self, account_id, level):
+        """
+        Retorna a marca d'água de (conta, nível)
+
+        Returns:
+            dict: {'since': 'YYYY-MM-DD', 'until': 'YYYY-MM-DD', 'synced_at': ...} ou None
+        """
+        return self._load_watermarks().get(self._key(account_id, level))
+
+    def _set_watermark(self, account_id, level, since, until, fields):
+        watermarks = self._load_watermarks()
+        watermarks[self._key(account_id, level)] = {
+            'since': since,
+            'until': until,
+            'filter': self.client.campaign_filter.signature(),
+            'fields': sorted(fields),
+            'synced_at': datetime.now().isoformat(),
+        }
+        self._write_json(self.watermark_file, watermarks)
+
+    @staticmethod
+    def _days(date_from, date_to):
+        """Datas 'YYYY-MM-DD' de date_from a date_to (inclusivo)"""
+        day = datetime.strptime(date_from, '%Y-%m-%d')
+        end = datetime.strptime(date_to, '%Y-%m-%d')
+        days = []
+        while day <= end:
+            days.append(day.strftime('%Y-%m-%d'))
+            day += timedelta(days=1)
+        return days
+
+    @classmethod
+    def _contiguous_runs(cls, days):
+        """Agrupa datas ordenadas em intervalos contíguos [(from, to), ...]"""
+        runs = []
+        for day in days:
+            if runs and cls._shift(runs[-1][1], 1) == day:
+                runs[-1][1] = day
+            else:
+                runs.append([day, day])
+        return [tuple(run) for run in runs]
+
+    @staticmethod
+    def _day_hash(row):
+        """Hash do conteúdo de um dia (métricas que a atribuição pode revisar)"""
+        values = [
+            row.get('impressions'),
+            row.get('clicks'),
+            round(row.get('spend') or 0, 2),
+            row.get('conversions'),
+            row.get('leads'),
+        ]
+        return hashlib.sha1(json.dumps(values).encode('utf-8')).hexdigest()
+
+    def _probe_day_hashes(self, date_from, date_to):
+        """
+        Consulta o período no nível conta, sem breakdown (uma linha por dia)
+
+        Returns:
+            dict: Data -> hash do conteúdo, ou None se a sonda falhar
+        """
+        try:
+            return {
+                row['date']: self._day_hash(row)
+                for row in self.client.iter_insights(
+                    date_from, date_to,
+                    level='account',
+                    breakdowns=(),
+                    profile='kpi',
+                    async_mode=False,
+                    window_days=0
+                )
+            }
+        except Exception as e:
+            print(f"⚠️  Sonda de reprocessamento falhou, recoletando todo o período: {e}")
+            return None
+
+    def _load_day_hashes(self):
+        if not self.hash_file.exists():
+            return {}
+        with open(self.hash_file, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _set_day_hashes(self, account_id, level, day_hashes):
+        hashes = self._load_day_hashes()
+        hashes.setdefault(self._key(account_id, level), {}).update(day_hashes)
+        self._write_json(self.hash_file, hashes)
+
+    def _record_stats(self, account_id, level, fetch_from, fetch_to, skipped_days, refetch_days, probe):
+        stats = {
+            'run_at': datetime.now().isoformat(),
+            'account_id': account_id,
+            'level': level,
+            'range': {'from': fetch_from, 'to': fetch_to},
+            'probed': probe is not None,
+            'skipped_days': len(skipped_days),
+            'refetched_days': len(refetch_days),
+            'refetched': refetch_days,
+        }
+        lines = []
+        if self.stats_file.exists():
+            with open(self.stats_file, encoding='utf-8') as f:
+                lines = [line for line in f if line.strip()]
+        lines.append(json.dumps(stats, ensure_ascii=False) + '\n')
+
+        tmp = self.stats_file.with_suffix(self.stats_file.suffix + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.writelines(lines[-self.STATS_MAX_RUNS:])
+        tmp.replace(self.stats_file)
+        return stats
+
+    def stats_report(self, limit=20):
+        """
+        Relatório das últimas sincronizações: dias recoletados x sem alteração
+
+        Args:
+            limit (int): Quantidade de execuções mais recentes
+
+        Returns:
+            dict: 'runs' (uma entrada por execução) e totais 'skipped_days'/'refetched_days'
+        """
+        runs = []
+        if self.stats_file.exists():
+            with open(self.stats_file, encoding='utf-8') as f:
+                runs = [json.loads(line) for line in f if line.strip()][-limit:]
+
+        return {
+            'runs': runs,
+            'skipped_days': sum(run['skipped_days'] for run in runs),
+            'refetched_days': sum(run['refetched_days'] for run in runs),
+        }
+
+    def _reusable(self, watermark, fields):
+        """
+        True se o histórico da marca d'água serve ao pedido: mesmo filtro de
+        campanhas e campos gravados que incluem todos os campos pedidos
+        (perfil + IDs do nível; marcas antigas de conjunto/anúncio sem
+        adset_id/ad_id deixam de valer e o período é recoletado)
+        """
+        return bool(
+            watermark
+            and watermark.get('filter') == self.client.campaign_filter.signature()
+            and set(fields) <= set(watermark.get('fields') or [])
+        )
+
+    def plan(self, date_from, date_to, level='campaign', profile='full', breakdowns=('impression_device',)):
+        """
+        Calcula o intervalo que precisa ser buscado na API
+
+        Returns:
+            tuple: (fetch_from, fetch_to) ou None se o histórico já cobre o período
+        """
+        watermark = self.get_watermark(self.client.ad_account_id, self.store_level(level, breakdowns))
+        fields = self.client.get_level_fields(profile, level)
+
+        # Sem histórico, pedido começa antes do que já temos, o filtro de
+        # campanhas mudou ou o histórico tem menos campos que o perfil: coleta completa
+        if not self._reusable(watermark, fields) or date_from < watermark['since']:
+            return date_from, date_to
+
+        restated = self._shift(watermark['until'], -(max(self.restatement_days, 1) - 1))
+        fetch_from = max(date_from, restated)
+
+        if fetch_from > date_to:
+            return None
+
+        return fetch_from, date_to
+
+    def sync(self, date_from, date_to, level='campaign', profile='full', breakdowns=('impression_device',)):
+        """
+        Sincroniza o período e retorna os registros a partir do store local
+
+        Args:
+            date_from (str): Data inicial no formato 'YYYY-MM-DD'
+            date_to (str): Data final no formato 'YYYY-MM-DD'
+            level (str): Nível dos dados ('account', 'campaign', 'adset', 'ad')
+            profile (str): Perfil de campos pedido à API ('kpi', 'device', 'full')
+            breakdowns (tuple): ('impression_device',) ou () para uma linha por
+                entidade/dia (ex.: resumo diário da conta, com alcance do Meta)
+
+        Returns:
+            dict: Mesmo formato de MetaAdsClient.get_insights, com 'fetched_range'
+                e 'restatement' (dias recoletados x sem alteração)
+        """
+        account_id = self.client.ad_account_id
+        api_level = level
+        level = self.store_level(level, breakdowns)
+        fetch_range = self.plan(date_from, date_to, api_level, profile, breakdowns)
+
+        restatement = None
+
+        if fetch_range:
+            fetch_from, fetch_to = fetch_range
+            watermark = self.get_watermark(account_id, level)
+            requested = self.client.get_level_fields(profile, api_level)
+            same_filter = self._reusable(watermark, requested)
+
+            # Sonda barata (nível conta, sem breakdown) decide quais dias mudaram;
+            # sem histórico aproveitável no período, todos os dias são coletados
+            # de qualquer forma e a sonda seria uma chamada a mais
+            overlaps = same_filter and fetch_from <= watermark['until'] and fetch_to >= watermark['since']
+            probe = self._probe_day_hashes(fetch_from, fetch_to) if overlaps else None
+            stored_hashes = self._load_day_hashes().get(self._key(account_id, level), {})
+
+            # Os dias recoletados trazem também os campos já gravados, para o
+            # store não misturar linhas com conjuntos de campos diferentes
+            fields = set(requested)
+            if watermark and watermark.get('filter') == self.client.campaign_filter.signature():
+                fields |= set(watermark.get('fields') or [])
+            extra_fields = sorted(fields - set(requested))
+
+            refetch_days = []
+            skipped_days = []
+            for day in self._days(fetch_from, fetch_to):
+                covered = same_filter and watermark['since'] <= day <= watermark['until']
+                unchanged = (
+                    covered and probe is not None
+                    and stored_hashes.get(day) is not None
+                    and stored_hashes[day] == probe.get(day, self.EMPTY_DAY_HASH)
+                )
+                (skipped_days if unchanged else refetch_days).append(day)
+
+            # Os dias recoletados são gravados no store página a página, conforme chegam
+            written = 0
+            try:
+                for run_from, run_to in self._contiguous_runs(refetch_days):
+                    written += self.store.replace_range(
+                        account_id, level, run_from, run_to,
+                        self.client.iter_insights(
+                            run_from, run_to, level=api_level, breakdowns=breakdowns,
+                            profile=profile, extra_fields=extra_fields
+                        )
+                    )
+            except Exception as e:
+                print(f"❌ Erro ao sincronizar insights: {e}")
+                return {
+                    'success': False,
+                    'error': str(e)
+                }
+
+            if probe is not None:
+                self._set_day_hashes(account_id, level, {
+                    day: probe.get(day, self.EMPTY_DAY_HASH) for day in refetch_days
+                })
+
+            # Só estende a marca d'água se o período continuar contíguo ao anterior
+            # (e coletado com o mesmo filtro de campanhas e campos compatíveis)
+            contiguous = same_filter and (
+                fetch_from <= self._shift(watermark['until'], 1)
+                and fetch_to >= self._shift(watermark['since'], -1)
+            )
+
+            if contiguous:
+                since = min(watermark['since'], date_from)
+                until = max(watermark['until'], fetch_to)
+            else:
+                since, until = fetch_from, fetch_to
+
+            self._set_watermark(account_id, level, since, until, fields)
+
+            restatement = self._record_stats(account_id, level, fetch_from, fetch_to, skipped_days, refetch_days, probe)
+
+            print(
+                f"🔄 Sincronização incremental: {written} registros de {fetch_from} a {fetch_to} "
+                f"({len(refetch_days)} dias recoletados, {len(skipped_days)} sem alteração)"
+            )
+        else:
+            print(f"💾 Histórico local cobre {date_from} a {date_to}")
+
+        rows = self.store.query(account_id, level, date_from, date_to)
+
+        return {
+            'success': True,
+            'data': rows,
+            'total_records': len(rows),
+            'date_range': {'from': date_from, 'to': date_to},
+            'fetched_range': (
+                {'from': fetch_range[0], 'to': fetch_range[1]} if fetch_range else None
+            ),
+            'restatement': restatement,
+        }